@@ -5,7 +5,7 @@ from fastapi import Depends
 from loguru import logger
 from sqlmodel import Session
 
-from src.core.db import engine
+from src.core.db import engine, read_engine
 
 
 def get_session() -> Generator[Session, None, None]:
@@ -17,3 +17,16 @@ def get_session() -> Generator[Session, None, None]:
 
 
 SessionDep = Annotated[Session, Depends(get_session)]
+
+
+def get_read_session() -> Generator[Session, None, None]:
+    """Provide an autocommit session for endpoints that only run single reads.
+
+    Not for multi-statement reads that need a consistent snapshot, or for
+    server-side cursors, which only live inside a transaction.
+    """
+    with Session(read_engine) as session:
+        yield session
+
+
+ReadSessionDep = Annotated[Session, Depends(get_read_session)]
@@ -5,20 +5,25 @@ This module provides HTTP endpoints for managing game ledgers, including
 file upload and import functionality for game data in CSV format.
 """
 
-from typing import TYPE_CHECKING, Annotated
+import asyncio
+from collections import Counter
+from collections.abc import Coroutine
+from pathlib import Path
+from typing import Annotated
 
 from fastapi import APIRouter, File, UploadFile
 from loguru import logger
 
 from src.core.exceptions import ValidationError
-from src.schemas.schemas import BatchUploadResponse
+from src.schemas.schemas import BatchUploadResponse, FileUploadResult
 from src.services.game_service import process_uploaded_file
 
-if TYPE_CHECKING:
-    from src.schemas.schemas import FileUploadResult
-
 router = APIRouter()
 
+# Upper bound on files from one batch being processed at the same time, so a
+# large batch can't monopolise the threadpool shared with other requests
+MAX_CONCURRENT_UPLOADS = 8
+
 
 @router.post("/upload", response_model=BatchUploadResponse)
 async def upload_game_ledgers(
@@ -28,22 +33,50 @@ async def upload_game_ledgers(
     Upload one or more CSV ledger files for games.
     Files will be saved to the 'ledgers' directory and then imported.
     """
-    logger.info(f"Received batch upload request with {len(files)} file(s)")
+    logger.info("Received batch upload request with {} file(s)", len(files))
 
     if not files:
         raise ValidationError(message="No files provided")
 
-    results: list[FileUploadResult] = []
+    # Files are independent, so process them concurrently instead of one by one
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
+
+    async def process_bounded(file: UploadFile) -> FileUploadResult:
+        async with semaphore:
+            return await process_uploaded_file(file)
+
+    async def skip_duplicate(filename: str) -> FileUploadResult:
+        return FileUploadResult(
+            filename=filename,
+            status="skipped",
+            message="Duplicate filename in batch",
+        )
+
+    # Files sharing a name would be saved to the same path concurrently, so
+    # only the first file of each name in the batch is processed
+    seen_filenames: set[str] = set()
+    uploads: list[Coroutine[None, None, FileUploadResult]] = []
     for file in files:
-        result = process_uploaded_file(file)
-        results.append(result)
+        filename = Path(file.filename).name if file.filename else None
+        if filename is not None and filename in seen_filenames:
+            uploads.append(skip_duplicate(filename))
+            continue
+        if filename is not None:
+            seen_filenames.add(filename)
+        uploads.append(process_bounded(file))
+
+    results: list[FileUploadResult] = await asyncio.gather(*uploads)
 
-    successful = sum(1 for r in results if r.status == "success")
-    failed = sum(1 for r in results if r.status == "error")
-    skipped = sum(1 for r in results if r.status == "skipped")
+    status_counts = Counter(r.status for r in results)
+    successful = status_counts["success"]
+    failed = status_counts["error"]
+    skipped = status_counts["skipped"]
 
     logger.info(
-        f"Batch upload complete: {successful} successful, {failed} failed, {skipped} skipped"
+        "Batch upload complete: {} successful, {} failed, {} skipped",
+        successful,
+        failed,
+        skipped,
     )
 
     return BatchUploadResponse(
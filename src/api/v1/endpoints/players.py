@@ -1,34 +1,77 @@
-from fastapi import APIRouter
+from collections.abc import Iterator, Sequence
+
+from fastapi import APIRouter, Response
+from fastapi.responses import StreamingResponse
 from loguru import logger
+from pydantic import TypeAdapter
 
-from src.api.deps import SessionDep
+from src.api.deps import ReadSessionDep, SessionDep
 from src.core.exceptions import NotFoundError
-from src.dao.player_dao import get_all_players, get_player_by_id
+from src.dao.player_dao import get_player_by_id_cached, iter_player_batches
 from src.models.models import Player
 
 router = APIRouter()
 
+# Serializes player pages straight to JSON bytes in pydantic-core, skipping
+# FastAPI's per-row response_model re-validation and stdlib json encoding
+_players_adapter = TypeAdapter(list[Player])
+_player_adapter = TypeAdapter(Player)
+
+
+def _encode_player_batches(batches: Iterator[Sequence[Player]]) -> Iterator[bytes]:
+    """Encode batches of players as the chunks of a single JSON array."""
+    yield b"["
+    first = True
+    for batch in batches:
+        if not batch:
+            continue
+        if not first:
+            yield b","
+        # Strip the brackets so each batch is spliced into the outer array
+        yield _players_adapter.dump_json(list(batch))[1:-1]
+        first = False
+    yield b"]"
+
 
 @router.get("/", response_model=list[Player])
 def read_players(
-    session: SessionDep, offset: int = 0, limit: int = 100
-) -> list[Player]:
-    """Retrieve a paginated list of players from the database."""
-    logger.info(f"Fetching players list (offset={offset}, limit={limit})")
-    players = get_all_players(session, offset=offset, limit=limit)
-    logger.debug(f"Retrieved {len(players)} players")
-    return players
+    session: SessionDep,
+    offset: int = 0,
+    limit: int = 100,
+    after_id: int | None = None,
+) -> StreamingResponse:
+    """Retrieve a paginated list of players from the database.
+
+    Use after_id (the last ID from the previous page) for keyset pagination.
+    Rows are streamed to the client in batches instead of being built into
+    one response body.
+    """
+    logger.info(
+        "Fetching players list (offset={}, limit={}, after_id={})",
+        offset,
+        limit,
+        after_id,
+    )
+    batches = iter_player_batches(
+        session, offset=offset, limit=limit, after_id=after_id
+    )
+    return StreamingResponse(
+        _encode_player_batches(batches), media_type="application/json"
+    )
 
 
 @router.get("/{player_id}", response_model=Player)
-def read_player(player_id: int, session: SessionDep) -> Player:
+def read_player(player_id: int, session: ReadSessionDep) -> Response:
     """Retrieve a specific player by ID from the database."""
-    logger.info(f"Fetching player with ID: {player_id}")
-    player = get_player_by_id(session, player_id)
+    logger.info("Fetching player with ID: {}", player_id)
+    player = get_player_by_id_cached(session, player_id)
     if not player:
         raise NotFoundError(
             message=f"Player {player_id} not found",
             details={"resource": "player", "id": player_id},
         )
-    logger.debug(f"Found player: {player.name}")
-    return player
+    logger.debug("Found player: {}", player.name)
+    # Players come straight from the database, so skip response_model checks
+    return Response(
+        content=_player_adapter.dump_json(player), media_type="application/json"
+    )
@@ -2,7 +2,8 @@ import os
 
 from dotenv import load_dotenv
 from loguru import logger
-from sqlmodel import SQLModel, create_engine
+from sqlalchemy import Connection, text
+from sqlmodel import Session, SQLModel, create_engine
 
 # Load environment variables from .env file
 load_dotenv()
@@ -24,11 +25,112 @@ elif postgres_url.startswith("postgresql://") and "+psycopg" not in postgres_url
     postgres_url = postgres_url.replace("postgresql://", "postgresql+psycopg://", 1)
 
 logger.info(f"Initializing database engine with URL: {postgres_url.split('@')[1]}")
-engine = create_engine(postgres_url)
+# Size the pool so concurrent requests don't queue behind the default five
+# connections; recycle and pre-ping connections so ones dropped by the server
+# while idle are replaced transparently instead of failing the next request.
+engine = create_engine(
+    postgres_url,
+    pool_size=20,
+    max_overflow=20,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    insertmanyvalues_page_size=1000,
+    connect_args={
+        # Cancel runaway queries instead of letting them hold a connection;
+        # bulk imports lift it with disable_statement_timeout
+        "options": "-c statement_timeout=30000",
+        # Detect dead peers on idle pooled connections
+        "keepalives": 1,
+        "keepalives_idle": 30,
+    },
+)
+
+# Read-only requests run in autocommit so single SELECTs skip the BEGIN/COMMIT
+# round-trips. Shares the pool above; the isolation level is reset on checkin.
+read_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+
+
+# create_all only creates missing tables, so columns and indexes added to the
+# models after a table already exists are applied here. Every statement is
+# idempotent and they run, in order, on each startup.
+_SCHEMA_UPGRADES = (
+    "ALTER TABLE game ADD COLUMN IF NOT EXISTS content_hash VARCHAR",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_game_content_hash ON game (content_hash)",
+    "CREATE INDEX IF NOT EXISTS ix_playergamestats_game_id ON playergamestats (game_id)",
+    "CREATE INDEX IF NOT EXISTS ix_ledgerentry_game_id ON ledgerentry (game_id)",
+)
+
+# Enforces PlayerGameStats' uq_pgs_player_game constraint on tables created
+# before it existed. Building it fails if duplicate results are already stored,
+# so it is only attempted once none remain.
+_PLAYER_GAME_UNIQUE_INDEX = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_pgs_player_game "
+    "ON playergamestats (player_id, game_id)"
+)
+_PLAYER_GAME_UNIQUE_INDEX_MISSING = "SELECT to_regclass('uq_pgs_player_game') IS NULL"
+_DUPLICATE_PLAYER_GAMES_EXIST = (
+    "SELECT EXISTS (SELECT 1 FROM playergamestats "
+    "GROUP BY player_id, game_id HAVING count(*) > 1)"
+)
+
+# Advisory lock key serialising schema upgrades across concurrently starting
+# workers; any constant works as long as nothing else uses it
+_SCHEMA_UPGRADE_LOCK_KEY = 0x70757472
 
 
 def create_db_and_tables() -> None:
     """Create database tables from SQLModel metadata."""
     logger.info("Creating database tables from SQLModel metadata...")
     SQLModel.metadata.create_all(engine)
+    upgrade_schema()
     logger.success("Database tables created successfully")
+
+
+def upgrade_schema() -> None:
+    """Apply schema changes that create_all cannot make to existing tables.
+
+    No-op on other database backends, whose schemas are only ever created
+    from scratch by tests.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as connection:
+        # Index builds on large tables can outlast the request timeout
+        disable_statement_timeout(connection)
+        connection.execute(
+            text("SELECT pg_advisory_xact_lock(:key)"),
+            {"key": _SCHEMA_UPGRADE_LOCK_KEY},
+        )
+        for statement in _SCHEMA_UPGRADES:
+            connection.execute(text(statement))
+
+        if not connection.execute(text(_PLAYER_GAME_UNIQUE_INDEX_MISSING)).scalar():
+            return
+        if connection.execute(text(_DUPLICATE_PLAYER_GAMES_EXIST)).scalar():
+            logger.error(
+                "playergamestats holds duplicate (player_id, game_id) rows; "
+                + "uq_pgs_player_game is not enforced until they are removed"
+            )
+            return
+        connection.execute(text(_PLAYER_GAME_UNIQUE_INDEX))
+
+
+def disable_synchronous_commit(session: Session) -> None:
+    """Let the session's current PostgreSQL transaction skip waiting on WAL flush.
+
+    Ledger imports can be replayed from the saved CSV files, so losing the last
+    few commits on a server crash is an acceptable trade for faster bulk loads.
+    No-op on other database backends.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        session.connection().execute(text("SET LOCAL synchronous_commit = OFF"))
+
+
+def disable_statement_timeout(connection: Connection) -> None:
+    """Lift the engine's statement timeout for the connection's current transaction.
+
+    For bulk imports and index builds, whose statements legitimately run longer
+    than any request should. No-op on other database backends.
+    """
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SET LOCAL statement_timeout = 0"))
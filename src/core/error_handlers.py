@@ -2,10 +2,10 @@
 
 from typing import TYPE_CHECKING, cast
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
 from loguru import logger
+import pydantic_core
 from sqlalchemy.exc import SQLAlchemyError
 
 from src.core.exceptions import (
@@ -16,6 +16,7 @@ from src.core.exceptions import (
     NotFoundError,
     ValidationError,
 )
+from src.core.responses import PydanticJSONResponse
 
 if TYPE_CHECKING:
     type ErrorPayload = dict[str, dict[str, str | ErrorDetails]]
@@ -30,93 +31,93 @@ def _error_payload(
     return {"error": {"code": code, "message": message, "details": details or {}}}
 
 
+def _error_response(
+    status_code: int,
+    code: str,
+    message: str,
+    details: ErrorDetails | None = None,
+) -> PydanticJSONResponse:
+    """Build an error response with the consistent payload."""
+    return PydanticJSONResponse(
+        status_code=status_code, content=_error_payload(code, message, details)
+    )
+
+
+# Bodies of the errors whose payload never varies, encoded once at import
+_DATABASE_ERROR_BODY = pydantic_core.to_json(
+    _error_payload("database_error", "Database error")
+)
+_INTERNAL_ERROR_BODY = pydantic_core.to_json(
+    _error_payload("internal_error", "Internal server error")
+)
+
+
+def not_found_handler(_: Request, exc: NotFoundError) -> Response:
+    """Return 404 for missing resources."""
+    logger.debug("NotFoundError: {}", exc.message)
+    return _error_response(404, exc.code, exc.message, exc.details)
+
+
+def validation_handler(_: Request, exc: ValidationError) -> Response:
+    """Return 422 for application-level validation failures."""
+    logger.warning("ValidationError: {}", exc.message)
+    return _error_response(422, exc.code, exc.message, exc.details)
+
+
+def conflict_handler(_: Request, exc: ConflictError) -> Response:
+    """Return 409 for conflicting writes."""
+    logger.warning("ConflictError: {}", exc.message)
+    return _error_response(409, exc.code, exc.message, exc.details)
+
+
+def internal_error_handler(_: Request, exc: InternalError) -> Response:
+    """Return 500 for internal invariant violations."""
+    logger.error("InternalError: {}", exc.message)
+    return _error_response(500, exc.code, exc.message, exc.details)
+
+
+def app_error_handler(_: Request, exc: AppError) -> Response:
+    """Return 400 for any other application error."""
+    logger.warning("AppError: {}", exc.message)
+    return _error_response(400, exc.code, exc.message, exc.details)
+
+
+def request_validation_handler(_: Request, exc: RequestValidationError) -> Response:
+    """Return 422 when FastAPI rejects the request parameters or body."""
+    logger.debug("Request validation failed: {}", exc.errors())
+    return _error_response(
+        422,
+        "request_validation_error",
+        "Request validation failed",
+        cast("ErrorDetails", {"errors": exc.errors()}),
+    )
+
+
+def sqlalchemy_handler(_: Request, exc: SQLAlchemyError) -> Response:
+    """Return 500 for database errors without leaking their details."""
+    logger.exception("Database error: {}", exc)
+    return Response(
+        content=_DATABASE_ERROR_BODY, status_code=500, media_type="application/json"
+    )
+
+
+def unhandled_handler(_: Request, exc: Exception) -> Response:
+    """Return 500 for any exception no other handler claimed."""
+    logger.exception("Unhandled exception: {}", exc)
+    return Response(
+        content=_INTERNAL_ERROR_BODY, status_code=500, media_type="application/json"
+    )
+
+
 def register_exception_handlers(app: FastAPI) -> None:
-    """Register all global exception handlers on the FastAPI app.
-
-    Note: The nested handler functions are registered via decorators and used by FastAPI
-    at runtime, but static analysis tools cannot detect this usage pattern.
-    """
-
-    @app.exception_handler(NotFoundError)
-    def not_found_handler(  # pyright: ignore[reportUnusedFunction]
-        _: Request, exc: NotFoundError
-    ) -> JSONResponse:
-        logger.debug(f"NotFoundError: {exc.message}")
-        return JSONResponse(
-            status_code=404,
-            content=_error_payload(exc.code, exc.message, exc.details),
-        )
-
-    @app.exception_handler(ValidationError)
-    def validation_handler(  # pyright: ignore[reportUnusedFunction]
-        _: Request, exc: ValidationError
-    ) -> JSONResponse:
-        logger.warning(f"ValidationError: {exc.message}")
-        return JSONResponse(
-            status_code=422,
-            content=_error_payload(exc.code, exc.message, exc.details),
-        )
-
-    @app.exception_handler(ConflictError)
-    def conflict_handler(  # pyright: ignore[reportUnusedFunction]
-        _: Request, exc: ConflictError
-    ) -> JSONResponse:
-        logger.warning(f"ConflictError: {exc.message}")
-        return JSONResponse(
-            status_code=409,
-            content=_error_payload(exc.code, exc.message, exc.details),
-        )
-
-    @app.exception_handler(InternalError)
-    def internal_error_handler(  # pyright: ignore[reportUnusedFunction]
-        _: Request, exc: InternalError
-    ) -> JSONResponse:
-        logger.error(f"InternalError: {exc.message}")
-        return JSONResponse(
-            status_code=500,
-            content=_error_payload(exc.code, exc.message, exc.details),
-        )
-
-    @app.exception_handler(AppError)
-    def app_error_handler(  # pyright: ignore[reportUnusedFunction]
-        _: Request, exc: AppError
-    ) -> JSONResponse:
-        logger.warning(f"AppError: {exc.message}")
-        return JSONResponse(
-            status_code=400,
-            content=_error_payload(exc.code, exc.message, exc.details),
-        )
-
-    @app.exception_handler(RequestValidationError)
-    def request_validation_handler(  # pyright: ignore[reportUnusedFunction]
-        _: Request, exc: RequestValidationError
-    ) -> JSONResponse:
-        logger.debug(f"Request validation failed: {exc.errors()}")
-        return JSONResponse(
-            status_code=422,
-            content=_error_payload(
-                "request_validation_error",
-                "Request validation failed",
-                cast("ErrorDetails", {"errors": exc.errors()}),
-            ),
-        )
-
-    @app.exception_handler(SQLAlchemyError)
-    def sqlalchemy_handler(  # pyright: ignore[reportUnusedFunction]
-        _: Request, exc: SQLAlchemyError
-    ) -> JSONResponse:
-        logger.exception(f"Database error: {exc}")
-        return JSONResponse(
-            status_code=500,
-            content=_error_payload("database_error", "Database error"),
-        )
-
-    @app.exception_handler(Exception)
-    def unhandled_handler(  # pyright: ignore[reportUnusedFunction]
-        _: Request, exc: Exception
-    ) -> JSONResponse:
-        logger.exception(f"Unhandled exception: {exc}")
-        return JSONResponse(
-            status_code=500,
-            content=_error_payload("internal_error", "Internal server error"),
-        )
+    """Register all global exception handlers on the FastAPI app."""
+    # exception_handler() rather than add_exception_handler() so each handler can
+    # annotate the exception type it actually receives
+    app.exception_handler(NotFoundError)(not_found_handler)
+    app.exception_handler(ValidationError)(validation_handler)
+    app.exception_handler(ConflictError)(conflict_handler)
+    app.exception_handler(InternalError)(internal_error_handler)
+    app.exception_handler(AppError)(app_error_handler)
+    app.exception_handler(RequestValidationError)(request_validation_handler)
+    app.exception_handler(SQLAlchemyError)(sqlalchemy_handler)
+    app.exception_handler(Exception)(unhandled_handler)
@@ -1,5 +1,6 @@
 """Logging configuration for PUTR v4 application."""
 
+import os
 from pathlib import Path
 import sys
 
@@ -15,12 +16,17 @@ def configure_logging() -> None:
     # Remove default handler (console only)
     logger.remove()
 
-    # Add console handler with colorization (SUCCESS and ERROR only)
+    # Console level comes from LOG_LEVEL (SUCCESS and ERROR only by default);
+    # ANSI colors are skipped in production where stdout is captured, not a tty
+    is_production = os.getenv("ENVIRONMENT", "development") == "production"
     logger.add(
         sink=sys.stdout,
         format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-        level="SUCCESS",  # Only show SUCCESS and ERROR in console
-        colorize=True,
+        level=os.getenv("LOG_LEVEL", "SUCCESS").upper(),
+        colorize=not is_production,
+        enqueue=True,  # Keep stdout writes off the request path
+        backtrace=False,  # Don't walk and format frames beyond the caught one
+        diagnose=False,  # Don't render local variable values into tracebacks
     )
 
     # Add file handler with rotation
@@ -0,0 +1,19 @@
+"""Response classes shared across the API."""
+
+from typing import override
+
+from fastapi.responses import JSONResponse
+import pydantic_core
+
+
+class PydanticJSONResponse(JSONResponse):
+    """JSON response encoded by pydantic-core instead of the stdlib json module.
+
+    Produces the same compact UTF-8 output as JSONResponse, but the encoding
+    runs in compiled code. Non-finite floats are written as null, matching
+    pydantic's own JSON serialization.
+    """
+
+    @override
+    def render(self, content: object) -> bytes:
+        return pydantic_core.to_json(content, inf_nan_mode="null")
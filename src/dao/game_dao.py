@@ -1,9 +1,33 @@
 """Data Access Object for Game operations."""
 
-from sqlmodel import Session, select
+from collections.abc import Collection, Mapping, Sequence
+from typing import TYPE_CHECKING, cast
+
+from sqlalchemy import exists, insert
+from sqlmodel import Session, col, select
 
 from src.models.models import Game, LedgerEntry, PlayerGameStats
 
+if TYPE_CHECKING:
+    import psycopg
+
+# Columns loaded by COPY, in the order each row's values are written
+_LEDGER_ENTRY_COPY_COLUMNS = (
+    "game_id",
+    "player_id",
+    "player_nickname",
+    "player_id_csv",
+    "session_start_at",
+    "session_end_at",
+    "buy_in",
+    "buy_out",
+    "stack",
+    "net",
+)
+_LEDGER_ENTRY_COPY_SQL = (
+    f"COPY ledgerentry ({', '.join(_LEDGER_ENTRY_COPY_COLUMNS)}) FROM STDIN"
+)
+
 
 def get_game_by_id(session: Session, game_id: int) -> Game | None:
     """Get a game by ID."""
@@ -15,6 +39,18 @@ def get_game_by_date(session: Session, date_str: str) -> Game | None:
     return session.exec(select(Game).where(Game.date_str == date_str)).first()
 
 
+def game_exists_for_date(session: Session, date_str: str) -> bool:
+    """Check if a game with the given date string exists."""
+    return session.exec(select(exists().where(col(Game.date_str) == date_str))).one()
+
+
+def game_exists_for_content_hash(session: Session, content_hash: str) -> bool:
+    """Check if a game was imported from a ledger file with the given SHA-256."""
+    return session.exec(
+        select(exists().where(col(Game.content_hash) == content_hash))
+    ).one()
+
+
 def create_game(session: Session, game: Game) -> Game:
     """Create a new game and return it with ID populated."""
     session.add(game)
@@ -24,10 +60,10 @@ def create_game(session: Session, game: Game) -> Game:
 
 def has_ledger_entries(session: Session, game_id: int) -> bool:
     """Check if a game has any ledger entries."""
-    return (
-        session.exec(select(LedgerEntry).where(LedgerEntry.game_id == game_id)).first()
-        is not None
-    )
+    # SELECT EXISTS(...) stops at the first match and returns a bare boolean
+    return session.exec(
+        select(exists().where(col(LedgerEntry.game_id) == game_id))
+    ).one()
 
 
 def create_ledger_entry(session: Session, entry: LedgerEntry) -> LedgerEntry:
@@ -36,6 +72,43 @@ def create_ledger_entry(session: Session, entry: LedgerEntry) -> LedgerEntry:
     return entry
 
 
+def bulk_create_ledger_entries(
+    session: Session, entries: Sequence[Mapping[str, object]]
+) -> None:
+    """Insert ledger entry rows in bulk, bypassing the ORM unit of work.
+
+    On PostgreSQL the rows are streamed with COPY FROM STDIN, which skips
+    per-row statement parsing entirely; each row must provide every column in
+    _LEDGER_ENTRY_COPY_COLUMNS. Other backends get a single executemany INSERT.
+    """
+    if not entries:
+        return
+    connection = session.connection()
+    if connection.dialect.name != "postgresql":
+        connection.execute(insert(LedgerEntry), entries)
+        return
+
+    driver_connection = cast(
+        "psycopg.Connection[tuple[object, ...]]",
+        connection.connection.driver_connection,
+    )
+    with (
+        driver_connection.cursor() as cursor,
+        cursor.copy(_LEDGER_ENTRY_COPY_SQL) as copy,
+    ):
+        for entry in entries:
+            copy.write_row([entry[column] for column in _LEDGER_ENTRY_COPY_COLUMNS])
+
+
+def get_player_ids_with_game_stats(session: Session, game_id: int) -> set[int]:
+    """Get the IDs of players that already have stats for a game."""
+    return set(
+        session.exec(
+            select(PlayerGameStats.player_id).where(PlayerGameStats.game_id == game_id)
+        ).all()
+    )
+
+
 def get_player_game_stats(
     session: Session, player_id: int, game_id: int
 ) -> PlayerGameStats | None:
@@ -56,6 +129,14 @@ def create_player_game_stats(
     return stats
 
 
+def bulk_create_player_game_stats(
+    session: Session, stats: Sequence[Mapping[str, object]]
+) -> None:
+    """Insert player game stats rows with a single executemany INSERT."""
+    if stats:
+        session.connection().execute(insert(PlayerGameStats), stats)
+
+
 def get_player_stats_with_games(
     session: Session, player_id: int
 ) -> list[tuple[PlayerGameStats, Game]]:
@@ -66,3 +147,37 @@ def get_player_stats_with_games(
         .where(PlayerGameStats.player_id == player_id)
     ).all()
     return list(results)
+
+
+def get_player_game_nets(session: Session, player_id: int) -> list[tuple[str, float]]:
+    """Get the (date_str, net) pair of every game a player has stats for.
+
+    Only the two columns are selected, so no ORM objects are built; this is
+    all the stats recalculation needs.
+    """
+    results = session.exec(
+        select(Game.date_str, PlayerGameStats.net)
+        .join(Game, PlayerGameStats.game_id == Game.id)  # type: ignore[arg-type]
+        .where(PlayerGameStats.player_id == player_id)
+    ).all()
+    return list(results)
+
+
+def get_game_nets_by_player(
+    session: Session, player_ids: Collection[int]
+) -> dict[int, list[tuple[str, float]]]:
+    """Get get_player_game_nets for several players with a single query.
+
+    Players without any game stats are absent from the result.
+    """
+    game_nets: dict[int, list[tuple[str, float]]] = {}
+    if not player_ids:
+        return game_nets
+    results = session.exec(
+        select(PlayerGameStats.player_id, Game.date_str, PlayerGameStats.net)
+        .join(Game, PlayerGameStats.game_id == Game.id)  # type: ignore[arg-type]
+        .where(col(PlayerGameStats.player_id).in_(player_ids))
+    )
+    for player_id, date_str, net in results:
+        game_nets.setdefault(player_id, []).append((date_str, net))
+    return game_nets
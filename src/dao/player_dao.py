@@ -1,28 +1,185 @@
 """Data Access Object for Player operations."""
 
-from sqlmodel import Session, select
+from collections.abc import Collection, Iterator, Mapping, Sequence
+from itertools import batched, chain
+import threading
+import time
+from typing import TYPE_CHECKING, cast
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import bindparam, event, insert, update
+from sqlalchemy.orm import Session as OrmSession, UOWTransaction
+from sqlmodel import Session, col, select
+from sqlmodel.sql.expression import SelectOfScalar
 
 from src.models.models import Player, PlayerNickname
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+# Players read through get_player_by_id_cached are kept for this long. Commits
+# only evict entries in their own process, so with several server workers this
+# also bounds how stale another worker's copy can be.
+PLAYER_CACHE_TTL_SECONDS = 10.0
+PLAYER_CACHE_MAX_SIZE = 10_000
+# Names per IN (...) query, well under SQLite's bind parameter limit
+NAME_LOOKUP_BATCH_SIZE = 1000
+
+# player_id -> (expiry time, detached player)
+_player_cache: dict[int, tuple[float, Player]] = {}
+_player_cache_lock = threading.Lock()
+# Bumped whenever a player's entry is evicted (per player) or the whole cache is
+# cleared (epoch). A reader only caches a row if neither changed while it was
+# loading, so a row read before a concurrent commit is never cached after it.
+_player_generations: dict[int, int] = {}
+_player_cache_epoch = 0
+# IDs of players written by each session's open transaction, evicted on commit
+_pending_evictions: WeakKeyDictionary[OrmSession, set[int]] = WeakKeyDictionary()
+
+
+@event.listens_for(OrmSession, "after_flush")
+def _track_player_writes(session: OrmSession, _: UOWTransaction) -> None:
+    """Remember which players a flush wrote so they are evicted on commit."""
+    written: Iterable[object] = chain(session.new, session.dirty, session.deleted)
+    player_ids = {
+        obj.id for obj in written if isinstance(obj, Player) and obj.id is not None
+    }
+    if player_ids:
+        _pending_evictions.setdefault(session, set()).update(player_ids)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _evict_committed_players(session: OrmSession) -> None:
+    """Drop cached copies of players changed by the committed transaction."""
+    player_ids = _pending_evictions.pop(session, set())
+    with _player_cache_lock:
+        for player_id in player_ids:
+            _player_cache.pop(player_id, None)
+            _player_generations[player_id] = _player_generations.get(player_id, 0) + 1
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_pending_evictions(session: OrmSession) -> None:
+    """Forget writes from a rolled back transaction; the cache is still valid."""
+    _pending_evictions.pop(session, None)
+
+
+def clear_player_cache() -> None:
+    """Drop every player cached by get_player_by_id_cached."""
+    global _player_cache_epoch  # noqa: PLW0603
+    with _player_cache_lock:
+        _player_cache.clear()
+        _player_cache_epoch += 1
+
 
 def get_player_by_id(session: Session, player_id: int) -> Player | None:
     """Get a player by ID."""
     return session.get(Player, player_id)
 
 
+def get_player_by_id_cached(session: Session, player_id: int) -> Player | None:
+    """Get a player by ID for read-only use, served from a short-lived cache.
+
+    Cached players are detached from any session and shared between callers,
+    so they must not be modified. Entries are evicted when a transaction that
+    wrote the player commits, and otherwise expire after
+    PLAYER_CACHE_TTL_SECONDS. Eviction only reaches this process's cache, so
+    other server processes may serve the previous stats until their copy
+    expires.
+    """
+    now = time.monotonic()
+    with _player_cache_lock:
+        cached = _player_cache.get(player_id)
+        version = (_player_cache_epoch, _player_generations.get(player_id, 0))
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    player = session.get(Player, player_id)
+    if player is None:
+        return None
+    session.expunge(player)
+    with _player_cache_lock:
+        # A commit evicted this player while it was loading; the row read may
+        # predate that commit, so return it without caching it
+        if version != (_player_cache_epoch, _player_generations.get(player_id, 0)):
+            return player
+        if len(_player_cache) >= PLAYER_CACHE_MAX_SIZE:
+            _player_cache.clear()
+        _player_cache[player_id] = (now + PLAYER_CACHE_TTL_SECONDS, player)
+    return player
+
+
 def get_player_by_name(session: Session, name: str) -> Player | None:
     """Get a player by name."""
     return session.exec(select(Player).where(Player.name == name)).first()
 
 
+def get_existing_player_names(session: Session, names: Collection[str]) -> set[str]:
+    """Return which of the given names already belong to a player.
+
+    Names are looked up NAME_LOOKUP_BATCH_SIZE at a time with an IN query, so
+    the lookup costs one round-trip per batch rather than one per name.
+    """
+    existing: set[str] = set()
+    for batch in batched(names, NAME_LOOKUP_BATCH_SIZE):
+        existing.update(
+            session.exec(select(Player.name).where(col(Player.name).in_(batch))).all()
+        )
+    return existing
+
+
 def get_all_players(
-    session: Session, offset: int = 0, limit: int = 100
+    session: Session, offset: int = 0, limit: int = 100, after_id: int | None = None
 ) -> list[Player]:
-    """Get all players with pagination."""
-    statement = select(Player).offset(offset).limit(limit)
+    """Get all players ordered by ID with pagination.
+
+    Passing after_id (the last ID of the previous page) pages by primary key
+    instead of OFFSET, so deep pages stay as cheap as the first one.
+    """
+    statement = _players_page_statement(offset, limit, after_id)
     return list(session.exec(statement).all())
 
 
+def get_player_ids(
+    session: Session, limit: int = 100, after_id: int | None = None
+) -> list[int]:
+    """Get a page of player IDs in order, without loading the player rows.
+
+    Pages by primary key the same way as get_all_players' after_id.
+    """
+    statement = select(Player.id).order_by(col(Player.id))
+    if after_id is not None:
+        statement = statement.where(col(Player.id) > after_id)
+    return cast("list[int]", list(session.exec(statement.limit(limit)).all()))
+
+
+def iter_player_batches(
+    session: Session,
+    offset: int = 0,
+    limit: int = 100,
+    after_id: int | None = None,
+    batch_size: int = 256,
+) -> Iterator[Sequence[Player]]:
+    """Stream the same page as get_all_players in batches of batch_size.
+
+    Rows are fetched with yield_per, so only one batch is held in memory at a
+    time. The session must stay open until the iterator is exhausted.
+    """
+    statement = _players_page_statement(offset, limit, after_id)
+    result = session.exec(statement.execution_options(yield_per=batch_size))
+    yield from result.partitions()
+
+
+def _players_page_statement(
+    offset: int, limit: int, after_id: int | None
+) -> SelectOfScalar[Player]:
+    """Build the ordered, paginated SELECT shared by the player list readers."""
+    statement = select(Player).order_by(col(Player.id))
+    if after_id is not None:
+        statement = statement.where(col(Player.id) > after_id)
+    return statement.offset(offset).limit(limit)
+
+
 def create_player(session: Session, player: Player) -> Player:
     """Create a new player and return it with ID populated."""
     session.add(player)
@@ -30,23 +187,88 @@ def create_player(session: Session, player: Player) -> Player:
     return player
 
 
+def bulk_create_players(
+    session: Session, players: Sequence[Mapping[str, object]]
+) -> dict[str, int]:
+    """Insert player rows in bulk and map each new player's name to its ID.
+
+    The IDs come back through INSERT ... RETURNING, so the whole batch costs
+    one round-trip per insertmanyvalues page instead of a flush per player.
+    """
+    if not players:
+        return {}
+    statement = insert(Player).returning(col(Player.name), col(Player.id))
+    rows = session.connection().execute(statement, players).tuples()
+    return {name: player_id for name, player_id in rows if player_id is not None}
+
+
 def update_player(session: Session, player: Player) -> Player:
     """Update an existing player."""
     session.add(player)
     return player
 
 
+def bulk_update_players(
+    session: Session, updates: Sequence[Mapping[str, object]]
+) -> None:
+    """Update several players with a single executemany UPDATE.
+
+    Each mapping holds the player's ID under "player_id" plus the columns to
+    set. The write bypasses the ORM, so copies of the players loaded in the
+    session are expired and the updated players are queued for eviction from
+    the player cache explicitly.
+    """
+    if not updates:
+        return
+    statement = update(Player).where(col(Player.id) == bindparam("player_id"))
+    session.connection().execute(statement, updates)
+
+    player_ids = {cast("int", row["player_id"]) for row in updates}
+    for player_id in player_ids:
+        loaded: object = session.identity_map.get(
+            session.identity_key(Player, player_id)
+        )
+        if loaded is not None:
+            session.expire(loaded)
+    _pending_evictions.setdefault(session, set()).update(player_ids)
+
+
 def get_player_by_nickname(session: Session, nickname: str) -> Player | None:
     """Find a player by their nickname."""
-    nickname_obj = session.exec(
-        select(PlayerNickname).where(PlayerNickname.nickname == nickname)
+    # Join rather than lazy-loading nickname.player, so a hit is one query
+    return session.exec(
+        select(Player)
+        .join(PlayerNickname, PlayerNickname.player_id == Player.id)  # type: ignore[arg-type]
+        .where(PlayerNickname.nickname == nickname)
     ).first()
-    if nickname_obj:
-        return nickname_obj.player
-    return None
+
+
+def get_player_ids_by_nickname(
+    session: Session, nicknames: Collection[str] | None = None
+) -> dict[str, int]:
+    """Map nicknames to their player's ID in a single query.
+
+    Only the given nicknames are looked up (unknown ones are omitted); with
+    nicknames=None every nickname is loaded, for callers resolving many
+    ledgers at once.
+    """
+    statement = select(PlayerNickname.nickname, PlayerNickname.player_id)
+    if nicknames is not None:
+        if not nicknames:
+            return {}
+        statement = statement.where(col(PlayerNickname.nickname).in_(nicknames))
+    return dict(session.exec(statement).all())
 
 
 def create_nickname(session: Session, nickname: PlayerNickname) -> PlayerNickname:
     """Create a new player nickname."""
     session.add(nickname)
     return nickname
+
+
+def bulk_create_nicknames(
+    session: Session, nicknames: Sequence[Mapping[str, object]]
+) -> None:
+    """Insert player nickname rows with a single executemany INSERT."""
+    if nicknames:
+        session.connection().execute(insert(PlayerNickname), nicknames)
@@ -12,6 +12,7 @@ from src.api.v1.router import api_router
 from src.core.db import create_db_and_tables
 from src.core.error_handlers import register_exception_handlers
 from src.core.logging_config import configure_logging
+from src.core.responses import PydanticJSONResponse
 from src.services.import_service import add_records
 
 
@@ -32,7 +33,7 @@ async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("Shutting down PUTR v4 application...")
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=PydanticJSONResponse)
 
 register_exception_handlers(app)
 
@@ -1,5 +1,6 @@
 """SQLModel data models for PUTR v4 application."""
 
+from sqlalchemy import UniqueConstraint
 from sqlmodel import Field, Relationship, SQLModel  # type: ignore
 
 
@@ -11,6 +12,8 @@ class Game(SQLModel, table=True):
 
     # We can link this to specific ledger CSV files later if needed
     ledger_filename: str | None = None
+    # SHA-256 hex digest of the ledger CSV, used to skip re-uploaded files
+    content_hash: str | None = Field(default=None, unique=True, index=True)
 
     # Relationships
     player_games: list["PlayerGameStats"] = Relationship(back_populates="game")  # type: ignore
@@ -63,10 +66,16 @@ class Player(SQLModel, table=True):
 class PlayerGameStats(SQLModel, table=True):
     """Link table between Player and Game with the result of that specific game."""
 
+    # One result per player per game; the (player_id, game_id) index also serves
+    # the per-player history lookups used by stats recalculation
+    __table_args__ = (
+        UniqueConstraint("player_id", "game_id", name="uq_pgs_player_game"),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
 
     player_id: int = Field(foreign_key="player.id")
-    game_id: int = Field(foreign_key="game.id")
+    game_id: int = Field(foreign_key="game.id", index=True)
 
     net: float
 
@@ -80,7 +89,7 @@ class LedgerEntry(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
 
     # Foreign Keys
-    game_id: int = Field(foreign_key="game.id")
+    game_id: int = Field(foreign_key="game.id", index=True)
     player_id: int = Field(foreign_key="player.id")
 
     # Raw CSV Columns
@@ -1,20 +1,120 @@
 """Game-related business logic."""
 
+from collections.abc import Generator
+from contextlib import contextmanager, suppress
+import hashlib
 from pathlib import Path
-import shutil
+import queue
+import threading
+from typing import BinaryIO, Protocol, cast
 
 from fastapi import UploadFile
 from loguru import logger
 from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
 
 from src.core.db import engine
 from src.core.exceptions import AppError
 from src.schemas.schemas import FileUploadResult
-from src.services.import_service import ImportResult, import_single_ledger
+from src.services.import_service import (
+    ImportResult,
+    import_single_ledger_from_stream,
+)
 
+# Directory uploaded ledgers are persisted to (relative to the working directory)
+LEDGERS_DIR = Path("ledgers")
 
-def process_uploaded_file(file: UploadFile) -> FileUploadResult:  # noqa: PLR0911
+# Read/write chunk size used when streaming uploads to disk
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Copy buffers are pooled and reused across uploads rather than allocating a
+# fresh chunk per read; one buffer per concurrently processed upload is kept
+UPLOAD_BUFFER_POOL_SIZE = 8
+_upload_buffers: queue.Queue[bytearray] = queue.Queue(UPLOAD_BUFFER_POOL_SIZE)
+
+# Imports recalculate player stats from each player's full game history, so two
+# ledgers sharing a player must not be imported in overlapping transactions.
+_import_lock = threading.Lock()
+
+
+def _resolve_ledger_path(filename: str) -> Path | None:
+    """Resolve where an upload is saved, or None if it escapes the ledgers dir."""
+    ledgers_dir = LEDGERS_DIR.resolve()
+    file_path = (ledgers_dir / filename).resolve()
+    # Verify the resolved path is within the ledgers directory (defense in depth)
+    if not file_path.is_relative_to(ledgers_dir):
+        return None
+    return file_path
+
+
+class _Readinto(Protocol):
+    def readinto(self, buffer: memoryview, /) -> int | None: ...
+
+
+@contextmanager
+def _upload_buffer() -> Generator[memoryview]:
+    """Borrow a chunk-sized copy buffer from the pool, returning it when done."""
+    try:
+        buffer = _upload_buffers.get_nowait()
+    except queue.Empty:
+        buffer = bytearray(UPLOAD_CHUNK_SIZE)
+    try:
+        with memoryview(buffer) as view:
+            yield view
+    finally:
+        with suppress(queue.Full):
+            _upload_buffers.put_nowait(buffer)
+
+
+def _copy_upload(source: BinaryIO, destination: BinaryIO | None = None) -> str:
+    """Read source through a pooled buffer and return its SHA-256 hex digest.
+
+    The data is also written to destination when one is given, so hashing and
+    copying share a single read loop.
+    """
+    digest = hashlib.sha256()
+    # Upload files are SpooledTemporaryFile or BytesIO, both of which support
+    # readinto even though BinaryIO does not declare it
+    reader = cast("_Readinto", source)
+    with _upload_buffer() as view:
+        while read := reader.readinto(view):
+            chunk = view[:read]
+            digest.update(chunk)
+            if destination is not None:
+                destination.write(chunk)
+    return digest.hexdigest()
+
+
+def _save_upload(source: BinaryIO, file_path: Path) -> str:
+    """Persist an uploaded file to disk, hashing it in the same pass.
+
+    Blocking; run it in the threadpool so the event loop stays free.
+
+    Returns:
+        SHA-256 hex digest of the upload.
+    """
+    file_path.parent.mkdir(exist_ok=True)
+    with file_path.open("wb") as buffer:
+        return _copy_upload(source, buffer)
+
+
+def _import_ledger(source: BinaryIO, filename: str, content_hash: str) -> ImportResult:
+    """Import an uploaded ledger from its stream in its own session and commit it.
+
+    The upload is parsed directly rather than re-reading the copy saved to disk.
+    Blocking; run it in the threadpool so the event loop stays free.
+    """
+    with _import_lock, Session(engine) as session:
+        source.seek(0)
+        result = import_single_ledger_from_stream(
+            session, source, filename, content_hash
+        )
+        session.commit()
+    return result
+
+
+async def process_uploaded_file(file: UploadFile) -> FileUploadResult:  # noqa: PLR0911
     """Process a single uploaded file. Returns result without raising exceptions."""
     if not file.filename:
         return FileUploadResult(
@@ -27,35 +127,29 @@ def process_uploaded_file(file: UploadFile) -> FileUploadResult:  # noqa: PLR091
     # Extract only the base name, removing any directory components
     filename = Path(file.filename).name
 
-    if not filename.endswith(".csv"):
+    # Case-insensitive, and rejects bare dotfiles like ".csv" that have no stem
+    if Path(filename).suffix.lower() != ".csv":
         return FileUploadResult(
             filename=filename,
             status="error",
             message="File must be a CSV",
         )
 
-    # Ensure ledgers directory exists
-    ledgers_dir = Path("ledgers").resolve()
-    ledgers_dir.mkdir(exist_ok=True)
-
-    file_path = (ledgers_dir / filename).resolve()
-
-    # Verify the resolved path is within the ledgers directory (defense in depth)
-    if not file_path.is_relative_to(ledgers_dir):
-        logger.warning(f"Path traversal attempt detected: {file.filename}")
+    file_path = _resolve_ledger_path(filename)
+    if file_path is None:
+        logger.warning("Path traversal attempt detected: {}", file.filename)
         return FileUploadResult(
             filename=filename,
             status="error",
             message="Invalid filename",
         )
-    logger.info(f"Saving file to: {file_path}")
+    logger.info("Saving file to: {}", file_path)
 
     try:
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        logger.success(f"File saved successfully: {filename}")
+        content_hash = await run_in_threadpool(_save_upload, file.file, file_path)
+        logger.success("File saved successfully: {}", filename)
     except OSError as e:
-        logger.error(f"Failed to save file {filename}: {e!s}")
+        logger.error("Failed to save file {}: {!s}", filename, e)
         return FileUploadResult(
             filename=filename,
             status="error",
@@ -63,28 +157,28 @@ def process_uploaded_file(file: UploadFile) -> FileUploadResult:  # noqa: PLR091
         )
 
     # Now import it
-    logger.info(f"Starting import of {filename}...")
+    logger.info("Starting import of {}...", filename)
     try:
-        with Session(engine) as session:
-            result = import_single_ledger(session, file_path)
-            session.commit()
-        logger.success(f"Import completed for {filename} with result: {result}")
+        result = await run_in_threadpool(
+            _import_ledger, file.file, filename, content_hash
+        )
+        logger.success("Import completed for {} with result: {}", filename, result)
     except SQLAlchemyError as e:
-        logger.error(f"Failed to import ledger {filename}: {e!s}")
+        logger.error("Failed to import ledger {}: {!s}", filename, e)
         return FileUploadResult(
             filename=filename,
             status="error",
             message=f"Failed to import ledger: {e!s}",
         )
     except AppError as e:
-        logger.error(f"Application error importing {filename}: {e.message}")
+        logger.error("Application error importing {}: {}", filename, e.message)
         return FileUploadResult(
             filename=filename,
             status="error",
             message=e.message,
         )
     except Exception as e:  # noqa: BLE001
-        logger.exception(f"Unexpected error processing {filename}: {e}")
+        logger.exception("Unexpected error processing {}: {}", filename, e)
         return FileUploadResult(
             filename=filename,
             status="error",
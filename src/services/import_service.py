@@ -1,30 +1,53 @@
+from collections import Counter
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 import csv
+from dataclasses import dataclass
 from enum import Enum
+from functools import partial
+import io
+from itertools import batched
 import json
 from pathlib import Path
-from typing import TypedDict, cast
+from typing import BinaryIO, TextIO, TypedDict, cast
 
 from loguru import logger
+from sqlalchemy import Index
 from sqlmodel import Session, SQLModel
 
-from src.core.db import create_db_and_tables, engine
+from src.core.db import (
+    create_db_and_tables,
+    disable_statement_timeout,
+    disable_synchronous_commit,
+    engine,
+)
 from src.core.exceptions import InternalError
 from src.dao.game_dao import (
+    bulk_create_ledger_entries,
+    bulk_create_player_game_stats,
     create_game,
-    create_ledger_entry,
-    create_player_game_stats,
-    get_game_by_date,
-    get_player_game_stats,
+    game_exists_for_content_hash,
+    game_exists_for_date,
+    get_player_ids_with_game_stats,
     has_ledger_entries,
 )
 from src.dao.player_dao import (
-    create_nickname,
-    create_player,
-    get_player_by_name,
-    get_player_by_nickname,
+    bulk_create_nicknames,
+    bulk_create_players,
+    get_existing_player_names,
+    get_player_ids_by_nickname,
+)
+from src.models.models import Game
+from src.services.player_stats_service import (
+    recalculate_all_player_stats,
+    recalculate_players_stats,
 )
-from src.models.models import Game, LedgerEntry, Player, PlayerGameStats, PlayerNickname
-from src.services.player_stats_service import recalculate_player_stats
+
+# Ledger rows inserted per executemany/COPY batch
+IMPORT_BATCH_SIZE = 5000
+
+# Ledger files imported concurrently by import_all_ledgers
+IMPORT_WORKERS = 4
 
 
 class ImportResult(Enum):
@@ -49,34 +72,42 @@ def add_records(backup_file: str = "full_backup.json") -> None:
     with Path(backup_file).open("r", encoding="utf-8") as f:
         backup_data = cast("dict[str, PlayerBackupData]", json.load(f))
 
-    added_count = 0
     skipped_count = 0
+    new_players: list[dict[str, object]] = []
+    new_nicknames: dict[str, list[str]] = {}
 
+    # The whole backup loads in one transaction: one commit (and WAL flush)
+    # instead of one per player, with players and nicknames bulk inserted
     with Session(engine) as session:
+        disable_statement_timeout(session.connection())
+        existing_names = get_existing_player_names(session, backup_data)
         for player_name, player_data in backup_data.items():
-            # Check if player already exists
-            existing_player = get_player_by_name(session, player_name)
-            if existing_player:
+            if player_name in existing_names:
                 skipped_count += 1
                 continue
 
-            player = Player(
-                name=player_name, flag=player_data["flag"], putr=player_data["putr"]
-            )
-            created_player = create_player(session, player)
-            if created_player.id is None:
-                raise InternalError(message="Player ID should be populated after flush")
-            for nickname in player_data["player_nicknames"]:
-                create_nickname(
-                    session,
-                    PlayerNickname(
-                        nickname=nickname,
-                        player_name=player_name,
-                        player_id=created_player.id,
-                    ),
-                )
-            session.commit()
-            added_count += 1
+            new_players.append({
+                "name": player_name,
+                "flag": player_data["flag"],
+                "putr": player_data["putr"],
+            })
+            new_nicknames[player_name] = player_data["player_nicknames"]
+
+        player_ids = bulk_create_players(session, new_players)
+        bulk_create_nicknames(
+            session,
+            [
+                {
+                    "nickname": nickname,
+                    "player_name": player_name,
+                    "player_id": player_ids[player_name],
+                }
+                for player_name, nicknames in new_nicknames.items()
+                for nickname in nicknames
+            ],
+        )
+        session.commit()
+    added_count = len(player_ids)
     logger.success(f"Added {added_count} players, skipped {skipped_count} existing.")
 
 
@@ -90,23 +121,133 @@ def reset_db() -> None:
     logger.success("Database reset successfully.")
 
 
-def import_all_ledgers(ledgers_dir: str = "ledgers") -> None:
-    """Import all CSV files from the ledgers directory strictly (no new players)."""
+def _import_ledger_file(
+    csv_file: Path, player_ids_by_nickname: Mapping[str, int]
+) -> ImportResult:
+    """Import one ledger in its own session and commit it, leaving stats stale."""
+    with Session(engine) as session:
+        disable_statement_timeout(session.connection())
+        result = import_single_ledger(
+            session,
+            csv_file,
+            recalculate_stats=False,
+            player_ids_by_nickname=player_ids_by_nickname,
+        )
+        session.commit()
+    return result
+
+
+def _bulk_load_indexes() -> list[Index]:
+    """Secondary indexes on the tables a bulk ledger import writes to.
+
+    Unique constraints are left alone since they enforce correctness.
+    """
+    return [
+        index
+        for table in ("ledgerentry", "playergamestats")
+        for index in SQLModel.metadata.tables[table].indexes
+        if not index.unique
+    ]
+
+
+def import_all_ledgers(
+    ledgers_dir: str = "ledgers", *, defer_indexes: bool = False
+) -> None:
+    """Import all CSV files from the ledgers directory strictly (no new players).
+
+    Each ledger is its own game, so files are imported concurrently and
+    committed one by one. Player stats are rebuilt once at the end, since
+    concurrent per-file recalculations would overwrite each other. A file that
+    raises does not stop the others, and its error is re-raised once the stats
+    of the committed ledgers are rebuilt.
+
+    Args:
+        ledgers_dir: Directory holding the ledger CSV files.
+        defer_indexes: Drop the ledger tables' secondary indexes for the
+            duration of the import and rebuild them once at the end, instead
+            of maintaining them row by row. Meant for initial bulk loads, not
+            for databases that are serving requests.
+    """
     ledgers_path = Path(ledgers_dir)
 
     if not ledgers_path.exists():
         logger.error(f"Error: {ledgers_dir} directory not found")
         return
 
-    csv_files = sorted(ledgers_path.glob("*.csv"))
+    # Uploads accept the .csv suffix in any case, so saved ledgers may be .CSV
+    csv_files = sorted(ledgers_path.glob("*.csv", case_sensitive=False))
     logger.info(f"Found {len(csv_files)} CSV files to import (STRICT MODE)")
 
+    # Every ledger resolves its nicknames against one map loaded up front,
+    # before any indexes are dropped so a failed lookup leaves them in place
     with Session(engine) as session:
-        for csv_file in csv_files:
-            logger.info(f"Processing (Strict): {csv_file.name}")
-            import_single_ledger(session, csv_file)
-        session.commit()
-        logger.success("All files imported successfully (Strict Mode)!")
+        player_ids_by_nickname = get_player_ids_by_nickname(session)
+    import_file = partial(
+        _import_ledger_file, player_ids_by_nickname=player_ids_by_nickname
+    )
+
+    indexes = _bulk_load_indexes() if defer_indexes else []
+    with engine.begin() as connection:
+        disable_statement_timeout(connection)
+        for index in indexes:
+            index.drop(connection, checkfirst=True)
+
+    try:
+        # SQLite allows a single writer, so there is nothing to gain from threads
+        workers = 1 if engine.dialect.name == "sqlite" else IMPORT_WORKERS
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(import_file, csv_file) for csv_file in csv_files]
+    finally:
+        with engine.begin() as connection:
+            disable_statement_timeout(connection)
+            for index in indexes:
+                index.create(connection, checkfirst=True)
+
+    # Every file has run by now. Ledgers commit one by one, so the ones imported
+    # alongside a failing file still get their players' stats rebuilt before
+    # the failure is raised.
+    results = [future.result() for future in futures if future.exception() is None]
+    if ImportResult.SUCCESS in results:
+        with Session(engine) as session:
+            disable_statement_timeout(session.connection())
+            recalculate_all_player_stats(session)
+            session.commit()
+    for future in futures:
+        if (error := future.exception()) is not None:
+            raise error
+    counts = Counter(results)
+    logger.success(
+        f"Imported {counts[ImportResult.SUCCESS]} of {len(results)} ledgers "
+        + f"(Strict Mode): {counts[ImportResult.GAME_EXISTS]} already existed, "
+        + f"{counts[ImportResult.MISSING_NICKNAMES]} had missing nicknames"
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class LedgerRow:
+    """A ledger CSV row reduced to the columns the import uses, already typed."""
+
+    player_nickname: str
+    player_id: str
+    session_start_at: str | None
+    session_end_at: str | None
+    buy_in: float
+    buy_out: float
+    stack: float
+    net: float
+
+
+# Ledger CSV columns the import reads, in LedgerRow field order
+_LEDGER_COLUMNS = (
+    "player_nickname",
+    "player_id",
+    "session_start_at",
+    "session_end_at",
+    "buy_in",
+    "buy_out",
+    "stack",
+    "net",
+)
 
 
 def _parse_float(val: str | None) -> float:
@@ -116,58 +257,224 @@ def _parse_float(val: str | None) -> float:
     return float(val)
 
 
+def _parse_ledger_rows(source: TextIO) -> list[LedgerRow]:  # noqa: PLR0914
+    """Parse ledger CSV rows, dropping unused columns and converting numbers once.
+
+    Reads plain field lists and picks columns by position instead of building
+    a dict per row with csv.DictReader. Missing columns and short rows read as
+    None, as they would from DictReader.
+    """
+    reader = csv.reader(source)
+    no_header: list[str] = []
+    header = next(reader, no_header)
+    width = len(header)
+    # Columns absent from the header point at a trailing slot that is always None
+    positions = {name: index for index, name in enumerate(header)}
+    (
+        nickname_at,
+        player_id_at,
+        start_at,
+        end_at,
+        buy_in_at,
+        buy_out_at,
+        stack_at,
+        net_at,
+    ) = (positions.get(name, width) for name in _LEDGER_COLUMNS)
+    padding: list[str | None] = [None] * (width + 1)
+
+    rows: list[LedgerRow] = []
+    for fields in reader:
+        if not fields:  # DictReader skips blank lines too
+            continue
+        values = [*fields[:width], *padding[min(len(fields), width) :]]
+        rows.append(
+            LedgerRow(
+                player_nickname=values[nickname_at] or "",
+                player_id=values[player_id_at] or "",
+                session_start_at=values[start_at],
+                session_end_at=values[end_at],
+                buy_in=_parse_float(values[buy_in_at]),
+                buy_out=_parse_float(values[buy_out_at]),
+                stack=_parse_float(values[stack_at]),
+                net=_parse_float(values[net_at]),
+            )
+        )
+    return rows
+
+
 def _validate_ledger_nicknames(
-    session: Session, csv_file: Path
-) -> tuple[list[dict[str, str]], list[Player]] | None:
-    """Validate all nicknames in a ledger file exist.
+    session: Session,
+    source: TextIO,
+    ledger_name: str,
+    player_ids_by_nickname: Mapping[str, int] | None = None,
+) -> tuple[list[LedgerRow], list[int]] | None:
+    """Validate all nicknames in a ledger exist.
 
-    Returns (rows, players) if all valid, None if any nickname is missing.
+    Nicknames are resolved against player_ids_by_nickname when given,
+    otherwise with one query for the whole file.
+
+    Returns (rows, player IDs) if all valid, None if any nickname is missing.
     """
-    rows: list[dict[str, str]] = []
-    players: list[Player] = []
+    player_ids: list[int] = []
     missing_nicknames: list[str] = []
+    rows = _parse_ledger_rows(source)
 
-    with csv_file.open(encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            rows.append(row)
-            nickname = row.get("player_nickname", "")
-            player = get_player_by_nickname(session, nickname)
-            if player:
-                players.append(player)
-            else:
-                missing_nicknames.append(nickname or "<unknown>")
+    if player_ids_by_nickname is None:
+        player_ids_by_nickname = get_player_ids_by_nickname(
+            session, {row.player_nickname for row in rows}
+        )
+    for row in rows:
+        nickname = row.player_nickname
+        player_id = player_ids_by_nickname.get(nickname)
+        if player_id is not None:
+            player_ids.append(player_id)
+        else:
+            missing_nicknames.append(nickname or "<unknown>")
 
     if missing_nicknames:
         logger.error(
-            f"Abandoning ledger {csv_file.name}: missing nicknames: {missing_nicknames}"
+            f"Abandoning ledger {ledger_name}: missing nicknames: {missing_nicknames}"
         )
         return None
 
-    return rows, players
+    return rows, player_ids
 
 
-def import_single_ledger(session: Session, csv_file: Path) -> ImportResult:
+def import_single_ledger(
+    session: Session,
+    csv_file: Path,
+    *,
+    recalculate_stats: bool = True,
+    player_ids_by_nickname: Mapping[str, int] | None = None,
+) -> ImportResult:
     """Import a single CSV ledger file strictly.
 
+    Args:
+        session: Database session to import into.
+        csv_file: Path of the ledger CSV.
+        recalculate_stats: Whether to refresh the aggregate stats of the
+            ledger's players. Bulk imports skip this and rebuild stats once.
+        player_ids_by_nickname: Preloaded nickname to player ID map. Bulk
+            imports share one so each ledger skips its nickname query.
+
+    Returns:
+        ImportResult indicating the outcome of the import.
+    """
+    with csv_file.open(encoding="utf-8", newline="", buffering=1 << 20) as f:
+        return _import_ledger(
+            session,
+            f,
+            csv_file.name,
+            content_hash=None,
+            recalculate_stats=recalculate_stats,
+            player_ids_by_nickname=player_ids_by_nickname,
+        )
+
+
+def import_single_ledger_from_stream(
+    session: Session, source: BinaryIO, filename: str, content_hash: str | None = None
+) -> ImportResult:
+    """Import a ledger strictly, parsing it straight from a binary stream.
+
+    Lets uploads be imported from the request body without re-reading the copy
+    persisted to disk. The stream is left open for its owner.
+
+    Args:
+        session: Database session to import into.
+        source: Binary stream of the ledger CSV.
+        filename: Name of the ledger file, used to derive the game date.
+        content_hash: SHA-256 hex digest of the file. When given, a ledger
+            whose hash matches an existing game is skipped before parsing.
+
     Returns:
         ImportResult indicating the outcome of the import.
     """
+    if content_hash is not None and game_exists_for_content_hash(session, content_hash):
+        logger.info(f"Ledger {filename} was already imported, skipping...")
+        return ImportResult.GAME_EXISTS
+
+    reader = io.TextIOWrapper(source, encoding="utf-8", newline="")
+    try:
+        return _import_ledger(session, reader, filename, content_hash)
+    finally:
+        reader.detach()
+
+
+def _insert_ledger_rows(
+    session: Session, game_id: int, rows: list[LedgerRow], player_ids: list[int]
+) -> set[int]:
+    """Insert a validated ledger's stats and entries, returning affected players."""
+    # Players with stats for this game are looked up once rather than per row;
+    # a player listed on several rows keeps the net of their first row
+    stats_player_ids = get_player_ids_with_game_stats(session, game_id)
+    affected_player_ids: set[int] = set()
+
+    # Second pass: insert rows in fixed-size batches (all nicknames are
+    # validated) so the pending insert rows stay bounded on large ledgers
+    for batch in batched(zip(rows, player_ids, strict=True), IMPORT_BATCH_SIZE):
+        stats_rows: list[dict[str, int | float]] = []
+        ledger_rows: list[dict[str, str | int | float | None]] = []
+        for row, player_id in batch:
+            if player_id not in stats_player_ids:
+                stats_player_ids.add(player_id)
+                stats_rows.append({
+                    "player_id": player_id,
+                    "game_id": game_id,
+                    "net": row.net,
+                })
+                affected_player_ids.add(player_id)
+
+            ledger_rows.append({
+                "game_id": game_id,
+                "player_id": player_id,
+                "player_nickname": row.player_nickname,
+                "player_id_csv": row.player_id,
+                "session_start_at": row.session_start_at,
+                "session_end_at": row.session_end_at,
+                "buy_in": row.buy_in,
+                "buy_out": row.buy_out,
+                "stack": row.stack,
+                "net": row.net,
+            })
+
+        # One batched INSERT per table instead of a round-trip per row
+        bulk_create_player_game_stats(session, stats_rows)
+        bulk_create_ledger_entries(session, ledger_rows)
+
+    return affected_player_ids
+
+
+def _import_ledger(  # noqa: PLR0913
+    session: Session,
+    source: TextIO,
+    filename: str,
+    content_hash: str | None,
+    *,
+    recalculate_stats: bool = True,
+    player_ids_by_nickname: Mapping[str, int] | None = None,
+) -> ImportResult:
+    """Import ledger rows read from source, named after the ledger's filename."""
     # Extract date from filename (e.g., "ledger23_09_26.csv" -> "23_09_26")
-    date_str = csv_file.stem.replace("ledger", "")
+    date_str = Path(filename).stem.replace("ledger", "")
 
     # First pass: validate all nicknames exist
-    validation_result = _validate_ledger_nicknames(session, csv_file)
+    validation_result = _validate_ledger_nicknames(
+        session, source, filename, player_ids_by_nickname
+    )
     if validation_result is None:
         return ImportResult.MISSING_NICKNAMES
-    rows, players = validation_result
+    rows, player_ids = validation_result
 
     # Check if game already exists
-    if get_game_by_date(session, date_str):
+    if game_exists_for_date(session, date_str):
         logger.info(f"Game {date_str} already exists, skipping...")
         return ImportResult.GAME_EXISTS
 
-    game = create_game(session, Game(date_str=date_str, ledger_filename=csv_file.name))
+    disable_synchronous_commit(session)
+    game = create_game(
+        session,
+        Game(date_str=date_str, ledger_filename=filename, content_hash=content_hash),
+    )
 
     if game.id is None:
         raise InternalError(message="Game ID should be populated after flush")
@@ -178,52 +485,13 @@ def import_single_ledger(session: Session, csv_file: Path) -> ImportResult:
         logger.info(f"Game {date_str} already has ledger entries, skipping...")
         return ImportResult.GAME_EXISTS
 
-    player_count = 0
-    affected_player_ids: set[int] = set()
-
-    # Second pass: process all rows (all nicknames are validated)
-    for row, player in zip(rows, players, strict=True):
-        # Player ID must exist since player was fetched from DB
-        if player.id is None:
-            raise InternalError(
-                message="Player ID should be populated for fetched player"
-            )
-        player_id: int = player.id
-        net = _parse_float(row.get("net"))
-
-        existing_stats = get_player_game_stats(session, player_id, game_id)
-
-        if not existing_stats:
-            create_player_game_stats(
-                session,
-                PlayerGameStats(
-                    player_id=player_id,
-                    game_id=game_id,
-                    net=net,
-                ),
-            )
-            affected_player_ids.add(player_id)
-
-        create_ledger_entry(
-            session,
-            LedgerEntry(
-                game_id=game_id,
-                player_id=player_id,
-                player_nickname=row.get("player_nickname", ""),
-                player_id_csv=row.get("player_id", ""),
-                session_start_at=row.get("session_start_at"),
-                session_end_at=row.get("session_end_at"),
-                buy_in=_parse_float(row.get("buy_in")),
-                buy_out=_parse_float(row.get("buy_out")),
-                stack=_parse_float(row.get("stack")),
-                net=net,
-            ),
-        )
-        player_count += 1
+    affected_player_ids = _insert_ledger_rows(session, game_id, rows, player_ids)
+    player_count = len(rows)
 
-    # Recalculate stats for all affected players after importing the game
-    for player_id in affected_player_ids:
-        recalculate_player_stats(session, player_id)
+    # Recalculate stats for all affected players after importing the game,
+    # reading their histories and writing their stats in one batch
+    if recalculate_stats:
+        recalculate_players_stats(session, affected_player_ids)
 
     logger.info(
         f"Imported game {date_str}: {player_count} records, "
@@ -1,18 +1,42 @@
 """Service for calculating player aggregate statistics."""
 
+from collections.abc import Collection, Sequence
 from datetime import datetime
+from functools import lru_cache
+from itertools import accumulate
+from typing import TypedDict
 
 from loguru import logger
 from sqlmodel import Session
 
 from src.core.exceptions import ValidationError
-from src.dao.game_dao import get_player_stats_with_games
-from src.dao.player_dao import get_all_players, get_player_by_id, update_player
+from src.dao.game_dao import get_game_nets_by_player, get_player_game_nets
+from src.dao.player_dao import (
+    bulk_update_players,
+    get_player_by_id,
+    get_player_ids,
+    update_player,
+)
 
 # Expected number of parts in date string: YY_MM_DD
 DATE_PARTS_COUNT = 3
 
 
+class PlayerStats(TypedDict):
+    """Aggregate stats stored on a Player, derived from their game history."""
+
+    net: float
+    games_up: int
+    games_down: int
+    average_net: float
+    biggest_win: float
+    biggest_loss: float
+    highest_net: float
+    lowest_net: float
+
+
+# Every player's recalculation parses the dates of the same games again
+@lru_cache(maxsize=8192)
 def parse_date_str(date_str: str) -> datetime:
     """Parse date_str format 'YY_MM_DD' or 'YY_MM_DD(N)' to datetime.
 
@@ -74,75 +98,76 @@ def recalculate_player_stats(session: Session, player_id: int) -> None:
         logger.warning(f"Player {player_id} not found, skipping stats calculation")
         return
 
-    stats_with_games = get_player_stats_with_games(session, player_id)
+    stats = _stats_from_game_nets(get_player_game_nets(session, player_id))
+    player.sqlmodel_update(dict(stats))
+    update_player(session, player)
+    logger.debug(
+        f"Updated stats for {player.name}: "
+        + f"net={stats['net']:.2f}, avg={stats['average_net']:.2f}"
+    )
+
 
-    if not stats_with_games:
+def _stats_from_game_nets(game_nets: Sequence[tuple[str, float]]) -> PlayerStats:
+    """Compute a player's aggregate stats from the (date_str, net) of their games."""
+    if not game_nets:
         # No games, reset stats to zero
-        player.net = 0.0
-        player.games_up = 0
-        player.games_down = 0
-        player.average_net = 0.0
-        player.biggest_win = 0.0
-        player.biggest_loss = 0.0
-        player.highest_net = 0.0
-        player.lowest_net = 0.0
-        update_player(session, player)
-        return
+        return PlayerStats(
+            net=0.0,
+            games_up=0,
+            games_down=0,
+            average_net=0.0,
+            biggest_win=0.0,
+            biggest_loss=0.0,
+            highest_net=0.0,
+            lowest_net=0.0,
+        )
 
     # Sort by date (convert date_str to datetime for proper ordering)
-    sorted_stats = sorted(
-        stats_with_games,
-        key=lambda x: parse_date_str(x[1].date_str),
+    sorted_nets = sorted(game_nets, key=lambda x: parse_date_str(x[0]))
+
+    # Split the date-ordered nets into wins, losses and the running total
+    nets = [net for _date_str, net in sorted_nets]
+    wins = [net for net in nets if net > 0]
+    losses = [net for net in nets if net < 0]
+    cumulative_nets = list(accumulate(nets))
+
+    # Rolling high/low of the cumulative net, starting from zero
+    highest_net = max(0.0, *cumulative_nets)
+    lowest_net = min(0.0, *cumulative_nets)
+
+    total_net = cumulative_nets[-1]
+    total_games = len(nets)
+    average_net = total_net / total_games
+
+    return PlayerStats(
+        net=total_net,
+        games_up=len(wins),
+        games_down=len(losses),
+        average_net=average_net,
+        biggest_win=max(wins, default=0.0),
+        biggest_loss=min(losses, default=0.0),
+        highest_net=highest_net,
+        lowest_net=lowest_net,
     )
 
-    # Calculate stats
-    total_net = 0.0
-    games_up = 0
-    games_down = 0
-    biggest_win = 0.0
-    biggest_loss = 0.0
-    highest_net = 0.0
-    lowest_net = 0.0
-    cumulative_net = 0.0
-
-    for stat, _game in sorted_stats:
-        game_net = stat.net
-
-        # Update cumulative for rolling high/low
-        cumulative_net += game_net
-
-        # Track highest and lowest cumulative net
-        highest_net = max(highest_net, cumulative_net)
-        lowest_net = min(lowest_net, cumulative_net)
-
-        # Count wins/losses
-        if game_net > 0:
-            games_up += 1
-            biggest_win = max(biggest_win, game_net)
-        elif game_net < 0:
-            games_down += 1
-            biggest_loss = min(biggest_loss, game_net)
-
-        total_net += game_net
-
-    # Calculate average
-    total_games = len(sorted_stats)
-    average_net = total_net / total_games if total_games > 0 else 0.0
-
-    # Update player record
-    player.net = total_net
-    player.games_up = games_up
-    player.games_down = games_down
-    player.average_net = average_net
-    player.biggest_win = biggest_win
-    player.biggest_loss = biggest_loss
-    player.highest_net = highest_net
-    player.lowest_net = lowest_net
 
-    update_player(session, player)
-    logger.debug(
-        f"Updated stats for {player.name}: "
-        + f"net={total_net:.2f}, games={total_games}, avg={average_net:.2f}"
+def recalculate_players_stats(session: Session, player_ids: Collection[int]) -> None:
+    """Recalculate the aggregate stats of several players at once.
+
+    Gives the same results as recalculate_player_stats for each player, but
+    one query fetches every player's game history and one executemany UPDATE
+    writes the stats back. Unknown player IDs are ignored.
+    """
+    game_nets = get_game_nets_by_player(session, player_ids)
+    bulk_update_players(
+        session,
+        [
+            {
+                "player_id": player_id,
+                **_stats_from_game_nets(game_nets.get(player_id, [])),
+            }
+            for player_id in player_ids
+        ],
     )
 
 
@@ -151,27 +176,27 @@ def recalculate_all_player_stats(session: Session) -> None:
 
     Useful for batch operations or data repair.
     """
-    # Paginate through all players to handle large datasets
-    offset = 0
+    # Paginate through all players by ID to handle large datasets
+    after_id: int | None = None
     limit = 100
     total_processed = 0
 
     while True:
-        players = get_all_players(session, offset=offset, limit=limit)
-        if not players:
+        player_ids = get_player_ids(session, limit=limit, after_id=after_id)
+        if not player_ids:
             break
 
-        logger.info(f"Processing batch of {len(players)} players (offset={offset})...")
+        logger.info(
+            f"Processing batch of {len(player_ids)} players (after_id={after_id})..."
+        )
 
-        for player in players:
-            if player.id is not None:
-                recalculate_player_stats(session, player.id)
-                total_processed += 1
+        recalculate_players_stats(session, player_ids)
+        total_processed += len(player_ids)
 
         # Break if we got fewer players than the limit (last page)
-        if len(players) < limit:
+        if len(player_ids) < limit:
             break
 
-        offset += limit
+        after_id = player_ids[-1]
 
     logger.success(f"Recalculated stats for {total_processed} players")
@@ -1,30 +1,84 @@
 """Pytest configuration and shared fixtures."""
 
-from collections.abc import Generator
+from collections.abc import Callable, Generator
 from pathlib import Path
+import sqlite3
 import tempfile
 
 import pytest
+from sqlalchemy import Engine, event, insert
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateIndex, CreateTable
 from sqlmodel import Session, SQLModel, create_engine
 
 from src.models.models import Game, Player, PlayerGameStats, PlayerNickname
 
+# Test databases are throwaway, so trade durability for less per-statement
+# journaling and syncing work in SQLite
+_SQLITE_TEST_PRAGMAS = (
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA locking_mode=EXCLUSIVE",
+)
 
-@pytest.fixture
-def test_engine():
-    """Create an in-memory SQLite database for testing."""
+
+def create_test_engine() -> Engine:
+    """Create an in-memory SQLite engine tuned for tests, without a schema."""
     engine = create_engine(
         "sqlite:///:memory:",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
-    SQLModel.metadata.create_all(engine)
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection: sqlite3.Connection, _: object) -> None:
+        for pragma in _SQLITE_TEST_PRAGMAS:
+            _ = dbapi_connection.execute(pragma)
+
+    return engine
+
+
+# The test schema compiled to SQLite DDL once at import, so each fresh test
+# database skips create_all's per-table existence checks and DDL compilation
+_SCHEMA_DDL = [
+    str(ddl.compile(dialect=sqlite.dialect()))
+    for table in SQLModel.metadata.sorted_tables
+    for ddl in (CreateTable(table), *map(CreateIndex, table.indexes))
+]
+
+
+def create_test_schema(engine: Engine) -> None:
+    """Create every table and index in a new, empty test database."""
+    with engine.begin() as connection:
+        for statement in _SCHEMA_DDL:
+            _ = connection.exec_driver_sql(statement)
+
+
+@pytest.fixture(scope="session")
+def _schema_engine():
+    """Create the in-memory SQLite database and its schema once per run."""
+    engine = create_test_engine()
+    create_test_schema(engine)
     yield engine
-    SQLModel.metadata.drop_all(engine)
     engine.dispose()
 
 
+@pytest.fixture
+def test_engine(_schema_engine):
+    """Provide the shared in-memory SQLite database, emptied after each test.
+
+    Tests commit through their own sessions, so rows are deleted afterwards
+    instead of rolling back a transaction; clearing the tables is much
+    cheaper than recreating the schema for every test.
+    """
+    yield _schema_engine
+    with _schema_engine.begin() as connection:
+        for table in reversed(SQLModel.metadata.sorted_tables):
+            connection.execute(table.delete())
+
+
 @pytest.fixture
 def session(test_engine) -> Generator[Session, None, None]:
     """Create a database session for testing."""
@@ -39,7 +93,6 @@ def sample_player(session) -> Player:
     player = Player(name="Test Player", flag="🇺🇸", putr="5.0")
     session.add(player)
     session.commit()
-    session.refresh(player)
     return player
 
 
@@ -55,7 +108,6 @@ def sample_player_with_nickname(session) -> Player:
     )
     session.add(nickname)
     session.commit()
-    session.refresh(player)
     return player
 
 
@@ -65,7 +117,6 @@ def sample_game(session) -> Game:
     game = Game(date_str="23_10_07", ledger_filename="ledger23_10_07.csv")
     session.add(game)
     session.commit()
-    session.refresh(game)
     return game
 
 
@@ -79,14 +130,17 @@ def sample_games(session) -> list[Game]:
         ("23_10_07", "ledger23_10_07.csv"),
         ("23_10_07(1)", "ledger23_10_07(1).csv"),
     ]
-    games = []
-    for date_str, filename in games_data:
-        game = Game(date_str=date_str, ledger_filename=filename)
-        session.add(game)
-        games.append(game)
+    # One executemany INSERT ... RETURNING loads the games with their IDs
+    games = list(
+        session.scalars(
+            insert(Game).returning(Game, sort_by_parameter_order=True),
+            [
+                {"date_str": date_str, "ledger_filename": filename}
+                for date_str, filename in games_data
+            ],
+        )
+    )
     session.commit()
-    for game in games:
-        session.refresh(game)
     return games
 
 
@@ -95,18 +149,34 @@ def player_with_game_stats(session, sample_player, sample_games) -> Player:
     """Create a player with multiple game stats for testing calculations."""
     # Game results: +100, -50, +200, -75, +25 = total +200
     nets = [100.0, -50.0, 200.0, -75.0, 25.0]
-    for game, net in zip(sample_games, nets, strict=True):
-        stats = PlayerGameStats(
-            player_id=sample_player.id,
-            game_id=game.id,
-            net=net,
-        )
-        session.add(stats)
+    session.connection().execute(
+        insert(PlayerGameStats),
+        [
+            {"player_id": sample_player.id, "game_id": game.id, "net": net}
+            for game, net in zip(sample_games, nets, strict=True)
+        ],
+    )
     session.commit()
-    session.refresh(sample_player)
     return sample_player
 
 
+@pytest.fixture(scope="session")
+def make_ledger(tmp_path_factory) -> Callable[[str, str], Path]:
+    """Return a helper that writes a dated ledger CSV to a temporary directory.
+
+    The directory is shared by the whole run and removed by pytest, so tests
+    don't need to clean up the files they write.
+    """
+    ledger_dir = tmp_path_factory.mktemp("ledgers")
+
+    def make(content: str, date_str: str = "23_11_25") -> Path:
+        ledger_path = ledger_dir / f"ledger{date_str}.csv"
+        ledger_path.write_text(content)
+        return ledger_path
+
+    return make
+
+
 @pytest.fixture
 def temp_csv_file() -> Generator[Path, None, None]:
     """Create a temporary CSV file for testing."""
@@ -1,53 +1,64 @@
 """Integration tests for API endpoints."""
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from io import BytesIO
 from pathlib import Path
 from unittest.mock import patch
 
-from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 import pytest
-from sqlalchemy.pool import StaticPool
-from sqlmodel import Session, SQLModel, create_engine
+from sqlalchemy import Engine
+from sqlmodel import Session, SQLModel
 
-from src.api.deps import get_session
+from src.api.deps import get_read_session, get_session
+from src.dao.player_dao import clear_player_cache
 from src.main import app
 from src.models.models import Game, Player, PlayerNickname
+from src.services.import_service import ImportResult, import_single_ledger_from_stream
+from tests.conftest import create_test_engine, create_test_schema
 
+# Async tests run under anyio's pytest plugin on the asyncio backend
+pytestmark = pytest.mark.anyio
 
-# Module-scoped fixture to clean ledgers directory
-@pytest.fixture(scope="module", autouse=True)
-def clean_ledgers_dir():
-    """Clean ledgers directory before and after all integration tests."""
-    ledgers_dir = Path("ledgers")
-
-    # Clean before tests
-    if ledgers_dir.exists():
-        for f in ledgers_dir.glob("ledger23_*.csv"):
-            f.unlink()
+# Ledger CSV bodies shared by the upload tests
+_CSV_HEADER = b"player_nickname,player_id,buy_in,buy_out,stack,net\n"
+_ALICE_WIN_100 = _CSV_HEADER + b"Alice,id1,100,200,200,100\n"
+_UNKNOWN_WIN_100 = _CSV_HEADER + b"Unknown,id1,100,200,200,100\n"
 
-    yield
 
-    # Clean after tests
-    if ledgers_dir.exists():
-        for f in ledgers_dir.glob("ledger23_*.csv"):
-            f.unlink()
+@pytest.fixture(scope="module", autouse=True)
+def ledgers_dir(tmp_path_factory) -> Generator[Path, None, None]:
+    """Save uploaded ledgers to a temporary directory instead of ./ledgers."""
+    directory = tmp_path_factory.mktemp("ledgers")
+    with patch("src.services.game_service.LEDGERS_DIR", directory):
+        yield directory
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="module")
 def test_engine():
-    """Create an in-memory SQLite database for testing."""
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    SQLModel.metadata.create_all(engine)
+    """Create an in-memory SQLite database for the module's tests."""
+    engine = create_test_engine()
+    create_test_schema(engine)
     yield engine
     SQLModel.metadata.drop_all(engine)
     engine.dispose()
 
 
+@pytest.fixture(autouse=True)
+def empty_tables(test_engine):
+    """Delete every row after each test so tests share the schema, not data.
+
+    Tests and the upload service commit through their own sessions, so
+    isolation comes from clearing the tables rather than a rolled back
+    transaction.
+    """
+    yield
+    with test_engine.begin() as connection:
+        for table in reversed(SQLModel.metadata.sorted_tables):
+            connection.execute(table.delete())
+    clear_player_cache()
+
+
 @pytest.fixture
 def test_session(test_engine) -> Generator[Session, None, None]:
     """Create a database session for testing."""
@@ -55,45 +66,90 @@ def test_session(test_engine) -> Generator[Session, None, None]:
         yield session
 
 
-@pytest.fixture
-def client(test_engine) -> Generator[TestClient, None, None]:
-    """Create a test client with overridden dependencies."""
+@pytest.fixture(scope="module")
+def anyio_backend() -> str:
+    """Run the async tests and the module-scoped client on asyncio."""
+    return "asyncio"
+
+
+@pytest.fixture(scope="module")
+async def client(test_engine) -> AsyncGenerator[AsyncClient, None]:
+    """Create one in-process async client with overridden dependencies.
+
+    Requests are dispatched to the app on the test's event loop rather than
+    through a portal thread. The app lifespan is not run, so startup never
+    touches the configured database.
+    """
 
     def get_test_session() -> Generator[Session, None, None]:
         with Session(test_engine) as session:
             yield session
 
     app.dependency_overrides[get_session] = get_test_session
+    app.dependency_overrides[get_read_session] = get_test_session
 
+    transport = ASGITransport(app=app, raise_app_exceptions=False)
     # Patch the engine in game_service to use our test engine
-    with (
-        patch("src.services.game_service.engine", test_engine),
-        TestClient(app, raise_server_exceptions=False) as test_client,
-    ):
-        yield test_client
+    with patch("src.services.game_service.engine", test_engine):
+        async with AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as test_client:
+            yield test_client
 
     app.dependency_overrides.clear()
 
 
-def create_player_with_nickname(session: Session, name: str, nickname: str) -> Player:
-    """Create a player with a nickname for testing."""
+def seed(engine: Engine, *rows: SQLModel) -> None:
+    """Insert rows in one committed session.
+
+    Instances are not expired on commit, so generated IDs stay readable after
+    the session closes.
+    """
+    with Session(engine, expire_on_commit=False) as session:
+        session.add_all(rows)
+        session.commit()
+
+
+def create_player_with_nickname(session: Session, name: str, nickname: str) -> int:
+    """Create a player with a nickname for testing and return the player's ID."""
     player = Player(name=name, flag="🏳️", putr="5.0")
-    session.add(player)
+    # The nickname's player_id is filled in when the unit of work inserts both
+    nick = PlayerNickname(nickname=nickname, player_name=name, player=player)
+    session.add_all([player, nick])
+    # The primary key is populated on flush; reading it before the commit
+    # expires the instance avoids reloading the row afterwards
     session.flush()
-    nick = PlayerNickname(nickname=nickname, player_name=name, player_id=player.id)
-    session.add(nick)
+    player_id = player.id
+    assert player_id is not None
+    session.commit()
+    return player_id
+
+
+def _upload_csv(session: Session, filename: str, csv_bytes: bytes) -> ImportResult:
+    """Import a ledger through the upload service's import path, skipping HTTP.
+
+    For tests that only assert on the resulting stats, this avoids a request
+    and response cycle per upload; the upload endpoint has its own tests.
+    """
+    result = import_single_ledger_from_stream(session, BytesIO(csv_bytes), filename)
     session.commit()
-    session.refresh(player)
-    return player
+    return result
+
+
+@pytest.fixture
+def alice(test_engine) -> int:
+    """Create player Alice with nickname "Alice" and return her ID."""
+    with Session(test_engine) as session:
+        return create_player_with_nickname(session, "Alice", "Alice")
 
 
 @pytest.mark.integration
 class TestRootEndpoint:
     """Tests for the root endpoint."""
 
-    def test_returns_welcome_message(self, client):
+    async def test_returns_welcome_message(self, client):
         """Test that root endpoint returns welcome message."""
-        response = client.get("/")
+        response = await client.get("/")
 
         assert response.status_code == 200
         assert response.json() == {"message": "Welcome to PUTR v4 API"}
@@ -103,82 +159,57 @@ class TestRootEndpoint:
 class TestPlayersListEndpoint:
     """Tests for GET /api/v1/players/."""
 
-    def test_returns_empty_list_when_no_players(self, client):
+    async def test_returns_empty_list_when_no_players(self, client):
         """Test getting players when database is empty."""
-        response = client.get("/api/v1/players/")
+        response = await client.get("/api/v1/players/")
 
         assert response.status_code == 200
         assert response.json() == []
 
-    def test_returns_all_players(self, client, test_engine):
+    async def test_returns_all_players(self, client, test_engine):
         """Test getting all players."""
-        with Session(test_engine) as session:
-            session.add(Player(name="Alice", flag="🇺🇸", putr="5.0"))
-            session.add(Player(name="Bob", flag="🇬🇧", putr="3.5"))
-            session.add(Player(name="Charlie", flag="🇨🇦", putr="UR"))
-            session.commit()
-
-        response = client.get("/api/v1/players/")
-
-        assert response.status_code == 200
-        players = response.json()
-        assert len(players) == 3
-        names = {p["name"] for p in players}
-        assert names == {"Alice", "Bob", "Charlie"}
-
-    def test_pagination_with_offset(self, client, test_engine):
-        """Test pagination with offset."""
-        with Session(test_engine) as session:
-            for i in range(5):
-                session.add(Player(name=f"Player{i}"))
-            session.commit()
-
-        response = client.get("/api/v1/players/?offset=2&limit=100")
-
-        assert response.status_code == 200
-        players = response.json()
-        assert len(players) == 3
-
-    def test_pagination_with_limit(self, client, test_engine):
-        """Test pagination with limit."""
-        with Session(test_engine) as session:
-            for i in range(5):
-                session.add(Player(name=f"Player{i}"))
-            session.commit()
+        seed(
+            test_engine,
+            Player(name="Alice", flag="🇺🇸", putr="5.0"),
+            Player(name="Bob", flag="🇬🇧", putr="3.5"),
+            Player(name="Charlie", flag="🇨🇦", putr="UR"),
+        )
 
-        response = client.get("/api/v1/players/?offset=0&limit=2")
+        response = await client.get("/api/v1/players/")
 
         assert response.status_code == 200
         players = response.json()
-        assert len(players) == 2
-
-    def test_pagination_combined(self, client, test_engine):
-        """Test pagination with both offset and limit."""
-        with Session(test_engine) as session:
-            for i in range(10):
-                session.add(Player(name=f"Player{i}"))
-            session.commit()
+        assert sorted(p["name"] for p in players) == ["Alice", "Bob", "Charlie"]
+
+    @pytest.mark.parametrize(
+        ("offset", "limit", "expected"),
+        [
+            pytest.param(2, 100, 8, id="offset"),
+            pytest.param(0, 2, 2, id="limit"),
+            pytest.param(3, 4, 4, id="combined"),
+        ],
+    )
+    async def test_pagination(self, client, test_engine, offset, limit, expected):
+        """Test pagination with offset, limit, and both combined."""
+        seed(test_engine, *(Player(name=f"Player{i}") for i in range(10)))
 
-        response = client.get("/api/v1/players/?offset=3&limit=4")
+        response = await client.get(f"/api/v1/players/?offset={offset}&limit={limit}")
 
         assert response.status_code == 200
         players = response.json()
-        assert len(players) == 4
+        assert len(players) == expected
 
 
 @pytest.mark.integration
 class TestPlayerDetailEndpoint:
     """Tests for GET /api/v1/players/{id}."""
 
-    def test_returns_player_when_found(self, client, test_engine):
+    async def test_returns_player_when_found(self, client, test_engine):
         """Test getting a specific player by ID."""
-        with Session(test_engine) as session:
-            player = Player(name="Alice", flag="🇺🇸", putr="5.0")
-            session.add(player)
-            session.commit()
-            player_id = player.id
+        player = Player(name="Alice", flag="🇺🇸", putr="5.0")
+        seed(test_engine, player)
 
-        response = client.get(f"/api/v1/players/{player_id}")
+        response = await client.get(f"/api/v1/players/{player.id}")
 
         assert response.status_code == 200
         data = response.json()
@@ -186,34 +217,31 @@ class TestPlayerDetailEndpoint:
         assert data["flag"] == "🇺🇸"
         assert data["putr"] == "5.0"
 
-    def test_returns_404_when_not_found(self, client):
+    async def test_returns_404_when_not_found(self, client):
         """Test getting a non-existent player returns 404."""
-        response = client.get("/api/v1/players/99999")
+        response = await client.get("/api/v1/players/99999")
 
         assert response.status_code == 404
         data = response.json()
         assert data["error"]["code"] == "not_found"
         assert "99999" in data["error"]["message"]
 
-    def test_includes_all_stats_fields(self, client, test_engine):
+    async def test_includes_all_stats_fields(self, client, test_engine):
         """Test that player response includes all calculated stats fields."""
-        with Session(test_engine) as session:
-            player = Player(
-                name="Alice",
-                net=250.0,
-                games_up=3,
-                games_down=1,
-                biggest_win=150.0,
-                biggest_loss=-50.0,
-                highest_net=300.0,
-                lowest_net=-25.0,
-                average_net=62.5,
-            )
-            session.add(player)
-            session.commit()
-            player_id = player.id
-
-        response = client.get(f"/api/v1/players/{player_id}")
+        player = Player(
+            name="Alice",
+            net=250.0,
+            games_up=3,
+            games_down=1,
+            biggest_win=150.0,
+            biggest_loss=-50.0,
+            highest_net=300.0,
+            lowest_net=-25.0,
+            average_net=62.5,
+        )
+        seed(test_engine, player)
+
+        response = await client.get(f"/api/v1/players/{player.id}")
 
         assert response.status_code == 200
         data = response.json()
@@ -231,18 +259,18 @@ class TestPlayerDetailEndpoint:
 class TestGamesUploadEndpoint:
     """Tests for POST /api/v1/games/upload."""
 
-    def test_empty_file_list_returns_422(self, client):
+    async def test_empty_file_list_returns_422(self, client):
         """Test that upload rejects empty file list with validation error."""
-        response = client.post("/api/v1/games/upload", files=[])
+        response = await client.post("/api/v1/games/upload", files=[])
 
         # FastAPI returns 422 for validation errors (empty required field)
         assert response.status_code == 422
 
-    def test_non_csv_file_returns_error_status(self, client):
+    async def test_non_csv_file_returns_error_status(self, client):
         """Test that non-CSV file returns 200 with error status in results."""
         files = [("files", ("test.txt", BytesIO(b"content"), "text/plain"))]
 
-        response = client.post("/api/v1/games/upload", files=files)
+        response = await client.post("/api/v1/games/upload", files=files)
 
         assert response.status_code == 200
         data = response.json()
@@ -250,15 +278,13 @@ class TestGamesUploadEndpoint:
         assert data["results"][0]["status"] == "error"
         assert "CSV" in data["results"][0]["message"]
 
-    def test_returns_batch_response_structure(self, client, test_engine):
+    @pytest.mark.usefixtures("alice")
+    async def test_returns_batch_response_structure(self, client):
         """Test that upload returns proper BatchUploadResponse structure."""
-        with Session(test_engine) as session:
-            create_player_with_nickname(session, "Alice", "Alice")
-
-        csv_content = b"player_nickname,player_id,buy_in,buy_out,stack,net\nAlice,id1,100,200,200,100\n"
+        csv_content = _ALICE_WIN_100
         files = [("files", ("ledger23_01_01.csv", BytesIO(csv_content), "text/csv"))]
 
-        response = client.post("/api/v1/games/upload", files=files)
+        response = await client.post("/api/v1/games/upload", files=files)
 
         assert response.status_code == 200
         data = response.json()
@@ -269,28 +295,26 @@ class TestGamesUploadEndpoint:
         assert "results" in data
         assert isinstance(data["results"], list)
 
-    def test_successful_upload_returns_success(self, client, test_engine):
+    @pytest.mark.usefixtures("alice")
+    async def test_successful_upload_returns_success(self, client):
         """Test that successful upload returns success status."""
-        with Session(test_engine) as session:
-            create_player_with_nickname(session, "Alice", "Alice")
-
-        csv_content = b"player_nickname,player_id,buy_in,buy_out,stack,net\nAlice,id1,100,250,250,150\n"
+        csv_content = _CSV_HEADER + b"Alice,id1,100,250,250,150\n"
         files = [("files", ("ledger23_01_02.csv", BytesIO(csv_content), "text/csv"))]
 
-        response = client.post("/api/v1/games/upload", files=files)
+        response = await client.post("/api/v1/games/upload", files=files)
 
         assert response.status_code == 200
         data = response.json()
         assert data["successful"] == 1
         assert data["results"][0]["status"] == "success"
 
-    def test_missing_nickname_returns_error(self, client):
+    async def test_missing_nickname_returns_error(self, client):
         """Test that missing nickname aborts ledger with error status."""
         # No players/nicknames created - strict mode will abort
-        csv_content = b"player_nickname,player_id,buy_in,buy_out,stack,net\nUnknown,id1,100,200,200,100\n"
+        csv_content = _UNKNOWN_WIN_100
         files = [("files", ("ledger23_01_03.csv", BytesIO(csv_content), "text/csv"))]
 
-        response = client.post("/api/v1/games/upload", files=files)
+        response = await client.post("/api/v1/games/upload", files=files)
 
         assert response.status_code == 200
         data = response.json()
@@ -298,73 +322,87 @@ class TestGamesUploadEndpoint:
         assert data["results"][0]["status"] == "error"
         assert "nickname" in data["results"][0]["message"].lower()
 
-    def test_duplicate_game_via_get_game_by_date_returns_skipped(
+    @pytest.mark.usefixtures("alice")
+    async def test_duplicate_game_via_get_game_by_date_returns_skipped(
         self, client, test_engine
     ):
         """Test that pre-existing Game record (no ledger entries) returns skipped."""
-        with Session(test_engine) as session:
-            create_player_with_nickname(session, "Alice", "Alice")
-            # Create game record only (no ledger entries)
-            game = Game(date_str="23_01_04", ledger_filename="ledger23_01_04.csv")
-            session.add(game)
-            session.commit()
+        # Create game record only (no ledger entries)
+        seed(
+            test_engine, Game(date_str="23_01_04", ledger_filename="ledger23_01_04.csv")
+        )
 
-        csv_content = b"player_nickname,player_id,buy_in,buy_out,stack,net\nAlice,id1,100,200,200,100\n"
+        csv_content = _ALICE_WIN_100
         files = [("files", ("ledger23_01_04.csv", BytesIO(csv_content), "text/csv"))]
 
-        response = client.post("/api/v1/games/upload", files=files)
+        response = await client.post("/api/v1/games/upload", files=files)
 
         assert response.status_code == 200
         data = response.json()
         assert data["skipped"] == 1
         assert data["results"][0]["status"] == "skipped"
 
-    def test_duplicate_via_has_ledger_entries_returns_skipped(
-        self, client, test_engine
-    ):
+    @pytest.mark.usefixtures("alice")
+    async def test_duplicate_via_has_ledger_entries_returns_skipped(self, client):
         """Test that re-upload after successful import returns skipped."""
-        with Session(test_engine) as session:
-            create_player_with_nickname(session, "Alice", "Alice")
-
-        csv_content = b"player_nickname,player_id,buy_in,buy_out,stack,net\nAlice,id1,100,200,200,100\n"
+        csv_content = _ALICE_WIN_100
 
         # First upload - should succeed
         files1 = [("files", ("ledger23_01_05.csv", BytesIO(csv_content), "text/csv"))]
-        response1 = client.post("/api/v1/games/upload", files=files1)
+        response1 = await client.post("/api/v1/games/upload", files=files1)
         assert response1.json()["successful"] == 1
 
         # Second upload - same date_str, should be skipped (has_ledger_entries guard)
         files2 = [("files", ("ledger23_01_05.csv", BytesIO(csv_content), "text/csv"))]
-        response2 = client.post("/api/v1/games/upload", files=files2)
+        response2 = await client.post("/api/v1/games/upload", files=files2)
 
         assert response2.status_code == 200
         data = response2.json()
         assert data["skipped"] == 1
         assert data["results"][0]["status"] == "skipped"
 
-    def test_multiple_files_with_mixed_results(self, client, test_engine):
-        """Test batch upload with mixed success/skip/error results."""
-        with Session(test_engine) as session:
-            create_player_with_nickname(session, "Alice", "Alice")
-            # Pre-create a game for skip test
-            game = Game(date_str="23_01_07", ledger_filename="ledger23_01_07.csv")
-            session.add(game)
-            session.commit()
+    @pytest.mark.usefixtures("alice")
+    async def test_duplicate_filename_in_batch_returns_skipped(
+        self, client, ledgers_dir
+    ):
+        """Test that only the first of two same-named files in a batch is saved."""
+        loss = _CSV_HEADER + b"Alice,id1,100,50,50,-50\n"
+        files = [
+            ("files", ("ledger23_01_09.csv", BytesIO(_ALICE_WIN_100), "text/csv")),
+            ("files", ("ledger23_01_09.csv", BytesIO(loss), "text/csv")),
+        ]
+
+        response = await client.post("/api/v1/games/upload", files=files)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [result["status"] for result in data["results"]] == [
+            "success",
+            "skipped",
+        ]
+        assert "Duplicate" in data["results"][1]["message"]
+        assert (ledgers_dir / "ledger23_01_09.csv").read_bytes() == _ALICE_WIN_100
 
-        csv_success = b"player_nickname,player_id,buy_in,buy_out,stack,net\nAlice,id1,100,200,200,100\n"
-        csv_skip = b"player_nickname,player_id,buy_in,buy_out,stack,net\nAlice,id1,100,150,150,50\n"
-        csv_error = b"player_nickname,player_id,buy_in,buy_out,stack,net\nUnknown,id1,100,200,200,100\n"
+    @pytest.mark.usefixtures("alice")
+    async def test_multiple_files_with_mixed_results(self, client, test_engine):
+        """Test batch upload with mixed success/skip/error results."""
+        # Pre-create a game for skip test
+        seed(
+            test_engine, Game(date_str="23_01_07", ledger_filename="ledger23_01_07.csv")
+        )
 
+        # One ledger each that succeeds, is skipped and fails
+        ledgers = {
+            "ledger23_01_06.csv": _ALICE_WIN_100,
+            "ledger23_01_07.csv": _CSV_HEADER + b"Alice,id1,100,150,150,50\n",
+            "ledger23_01_08.csv": _UNKNOWN_WIN_100,
+        }
         files = [
-            (
-                "files",
-                ("ledger23_01_06.csv", BytesIO(csv_success), "text/csv"),
-            ),  # success
-            ("files", ("ledger23_01_07.csv", BytesIO(csv_skip), "text/csv")),  # skipped
-            ("files", ("ledger23_01_08.csv", BytesIO(csv_error), "text/csv")),  # error
+            ("files", (filename, BytesIO(content), "text/csv"))
+            for filename, content in ledgers.items()
         ]
 
-        response = client.post("/api/v1/games/upload", files=files)
+        response = await client.post("/api/v1/games/upload", files=files)
 
         assert response.status_code == 200
         data = response.json()
@@ -378,18 +416,14 @@ class TestGamesUploadEndpoint:
 class TestPlayerStatsAfterImport:
     """Tests verifying player stats are updated after game imports."""
 
-    def test_stats_updated_after_single_import(self, client, test_engine):
+    async def test_stats_updated_after_single_import(self, client, alice):
         """Test that player stats are updated after importing a game."""
-        with Session(test_engine) as session:
-            player = create_player_with_nickname(session, "Alice", "Alice")
-            player_id = player.id
-
-        csv_content = b"player_nickname,player_id,buy_in,buy_out,stack,net\nAlice,id1,100,350,350,250\n"
+        csv_content = _CSV_HEADER + b"Alice,id1,100,350,350,250\n"
         files = [("files", ("ledger23_02_01.csv", BytesIO(csv_content), "text/csv"))]
 
-        client.post("/api/v1/games/upload", files=files)
+        await client.post("/api/v1/games/upload", files=files)
 
-        response = client.get(f"/api/v1/players/{player_id}")
+        response = await client.get(f"/api/v1/players/{alice}")
         data = response.json()
 
         assert data["net"] == 250.0
@@ -399,122 +433,88 @@ class TestPlayerStatsAfterImport:
         assert data["highest_net"] == 250.0
         assert data["lowest_net"] == 0.0
 
-    def test_stats_accumulate_over_multiple_imports(self, client, test_engine):
+    def test_stats_accumulate_over_multiple_imports(self, test_session, alice):
         """Test that player stats accumulate correctly over multiple games."""
-        with Session(test_engine) as session:
-            player = create_player_with_nickname(session, "Alice", "Alice")
-            player_id = player.id
-
         # First game: +100
-        csv1 = b"player_nickname,player_id,buy_in,buy_out,stack,net\nAlice,id1,100,200,200,100\n"
-        files1 = [("files", ("ledger23_02_02.csv", BytesIO(csv1), "text/csv"))]
-        client.post("/api/v1/games/upload", files=files1)
+        _upload_csv(test_session, "ledger23_02_02.csv", _ALICE_WIN_100)
 
         # Second game: -50
-        csv2 = b"player_nickname,player_id,buy_in,buy_out,stack,net\nAlice,id1,100,50,50,-50\n"
-        files2 = [("files", ("ledger23_02_03.csv", BytesIO(csv2), "text/csv"))]
-        client.post("/api/v1/games/upload", files=files2)
+        csv2 = _CSV_HEADER + b"Alice,id1,100,50,50,-50\n"
+        _upload_csv(test_session, "ledger23_02_03.csv", csv2)
 
-        response = client.get(f"/api/v1/players/{player_id}")
-        data = response.json()
+        player = test_session.get(Player, alice)
+        assert player is not None
 
-        assert data["net"] == 50.0  # 100 - 50
-        assert data["games_up"] == 1
-        assert data["games_down"] == 1
-        assert data["biggest_win"] == 100.0
-        assert data["biggest_loss"] == -50.0
+        assert player.net == 50.0  # 100 - 50
+        assert player.games_up == 1
+        assert player.games_down == 1
+        assert player.biggest_win == 100.0
+        assert player.biggest_loss == -50.0
 
-    def test_negative_first_rolling_stats(self, client, test_engine):
+    def test_negative_first_rolling_stats(self, test_session, alice):
         """Test rolling highest/lowest net when first game is negative."""
-        with Session(test_engine) as session:
-            player = create_player_with_nickname(session, "Alice", "Alice")
-            player_id = player.id
-
-        # First game: -100 (cumulative: -100, high: 0, low: -100)
-        csv1 = b"player_nickname,player_id,buy_in,buy_out,stack,net\nAlice,id1,200,100,100,-100\n"
-        files1 = [("files", ("ledger23_02_04.csv", BytesIO(csv1), "text/csv"))]
-        client.post("/api/v1/games/upload", files=files1)
-
-        response1 = client.get(f"/api/v1/players/{player_id}")
-        data1 = response1.json()
-        assert data1["net"] == -100.0
-        assert data1["highest_net"] == 0.0
-        assert data1["lowest_net"] == -100.0
-
-        # Second game: +200 (cumulative: 100, high: 100, low: -100)
-        csv2 = b"player_nickname,player_id,buy_in,buy_out,stack,net\nAlice,id1,100,300,300,200\n"
-        files2 = [("files", ("ledger23_02_05.csv", BytesIO(csv2), "text/csv"))]
-        client.post("/api/v1/games/upload", files=files2)
-
-        response2 = client.get(f"/api/v1/players/{player_id}")
-        data2 = response2.json()
-        assert data2["net"] == 100.0
-        assert data2["highest_net"] == 100.0
-        assert data2["lowest_net"] == -100.0
-
-        # Third game: -150 (cumulative: -50, high: 100, low: -100)
-        csv3 = b"player_nickname,player_id,buy_in,buy_out,stack,net\nAlice,id1,200,50,50,-150\n"
-        files3 = [("files", ("ledger23_02_06.csv", BytesIO(csv3), "text/csv"))]
-        client.post("/api/v1/games/upload", files=files3)
-
-        response3 = client.get(f"/api/v1/players/{player_id}")
-        data3 = response3.json()
-        assert data3["net"] == -50.0
-        assert data3["highest_net"] == 100.0
-        assert data3["lowest_net"] == -100.0
+        ledgers = [
+            # -100 (cumulative: -100, high: 0, low: -100)
+            ("ledger23_02_04.csv", _CSV_HEADER + b"Alice,id1,200,100,100,-100\n"),
+            # +200 (cumulative: 100, high: 100, low: -100)
+            ("ledger23_02_05.csv", _CSV_HEADER + b"Alice,id1,100,300,300,200\n"),
+            # -150 (cumulative: -50, high: 100, low: -100)
+            ("ledger23_02_06.csv", _CSV_HEADER + b"Alice,id1,200,50,50,-150\n"),
+        ]
+        for filename, csv_bytes in ledgers:
+            import_single_ledger_from_stream(test_session, BytesIO(csv_bytes), filename)
+        test_session.commit()
+
+        player = test_session.get(Player, alice)
+        assert player is not None
+        assert player.net == -50.0
+        assert player.highest_net == 100.0
+        assert player.lowest_net == -100.0
 
 
 @pytest.mark.integration
 class TestMultiplePlayersInGame:
     """Tests for games with multiple players."""
 
-    def test_all_players_stats_updated(self, client, test_engine):
+    async def test_all_players_stats_updated(self, client, test_engine):
         """Test that all players in a game have their stats updated."""
         with Session(test_engine) as session:
-            alice = create_player_with_nickname(session, "Alice", "Alice")
-            bob = create_player_with_nickname(session, "Bob", "Bob")
-            alice_id = alice.id
-            bob_id = bob.id
+            alice_id = create_player_with_nickname(session, "Alice", "Alice")
+            bob_id = create_player_with_nickname(session, "Bob", "Bob")
 
         csv_content = (
-            b"player_nickname,player_id,buy_in,buy_out,stack,net\n"
-            b"Alice,id1,100,200,200,100\n"
-            b"Bob,id2,100,50,50,-50\n"
+            _CSV_HEADER + b"Alice,id1,100,200,200,100\nBob,id2,100,50,50,-50\n"
         )
         files = [("files", ("ledger23_03_01.csv", BytesIO(csv_content), "text/csv"))]
 
-        client.post("/api/v1/games/upload", files=files)
+        await client.post("/api/v1/games/upload", files=files)
 
-        alice_response = client.get(f"/api/v1/players/{alice_id}")
-        bob_response = client.get(f"/api/v1/players/{bob_id}")
+        alice_response = await client.get(f"/api/v1/players/{alice_id}")
+        bob_response = await client.get(f"/api/v1/players/{bob_id}")
 
         assert alice_response.json()["net"] == 100.0
         assert bob_response.json()["net"] == -50.0
 
-    def test_zero_sum_verification(self, client, test_engine):
+    async def test_zero_sum_verification(self, client, test_engine):
         """Test that aggregate net across all players is approximately zero."""
         with Session(test_engine) as session:
-            alice = create_player_with_nickname(session, "Alice", "Alice")
-            bob = create_player_with_nickname(session, "Bob", "Bob")
-            charlie = create_player_with_nickname(session, "Charlie", "Charlie")
-            alice_id = alice.id
-            bob_id = bob.id
-            charlie_id = charlie.id
+            alice_id = create_player_with_nickname(session, "Alice", "Alice")
+            bob_id = create_player_with_nickname(session, "Bob", "Bob")
+            charlie_id = create_player_with_nickname(session, "Charlie", "Charlie")
 
         # Alice wins 150, Bob loses 100, Charlie loses 50 (sum = 0)
         csv_content = (
-            b"player_nickname,player_id,buy_in,buy_out,stack,net\n"
-            b"Alice,id1,100,250,250,150\n"
+            _CSV_HEADER + b"Alice,id1,100,250,250,150\n"
             b"Bob,id2,200,100,100,-100\n"
             b"Charlie,id3,100,50,50,-50\n"
         )
         files = [("files", ("ledger23_03_02.csv", BytesIO(csv_content), "text/csv"))]
 
-        client.post("/api/v1/games/upload", files=files)
+        await client.post("/api/v1/games/upload", files=files)
 
-        alice_net = client.get(f"/api/v1/players/{alice_id}").json()["net"]
-        bob_net = client.get(f"/api/v1/players/{bob_id}").json()["net"]
-        charlie_net = client.get(f"/api/v1/players/{charlie_id}").json()["net"]
+        alice_net = (await client.get(f"/api/v1/players/{alice_id}")).json()["net"]
+        bob_net = (await client.get(f"/api/v1/players/{bob_id}")).json()["net"]
+        charlie_net = (await client.get(f"/api/v1/players/{charlie_id}")).json()["net"]
 
         total_net = alice_net + bob_net + charlie_net
         assert total_net == pytest.approx(0.0, abs=0.01)
@@ -2,7 +2,7 @@
 
 import importlib
 import os
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import src.core.db
 
@@ -50,3 +50,92 @@ class TestDatabaseUrlNormalization:
 
             assert "localhost" in src.core.db.postgres_url
             assert "5433" in src.core.db.postgres_url
+
+
+class TestReadEngine:
+    """Tests for the autocommit read engine."""
+
+    def test_read_engine_autocommits_on_shared_pool(self):
+        """Test that reads autocommit while reusing the main connection pool."""
+        options = src.core.db.read_engine.get_execution_options()
+
+        assert options["isolation_level"] == "AUTOCOMMIT"
+        assert src.core.db.read_engine.pool is src.core.db.engine.pool
+
+
+class TestUpgradeSchema:
+    """Tests for the startup schema upgrades."""
+
+    @staticmethod
+    def _run_upgrade(*scalars: bool) -> list[str]:
+        """Run upgrade_schema against a mock PostgreSQL engine.
+
+        Returns:
+            The SQL of every statement executed, in order.
+        """
+        mock_engine = MagicMock()
+        mock_engine.dialect.name = "postgresql"
+        connection = mock_engine.begin.return_value.__enter__.return_value
+        connection.dialect.name = "postgresql"
+        connection.execute.return_value.scalar.side_effect = scalars
+
+        with patch("src.core.db.engine", mock_engine):
+            src.core.db.upgrade_schema()
+
+        return [str(call.args[0]) for call in connection.execute.call_args_list]
+
+    def test_runs_upgrades_under_advisory_lock_on_postgresql(self):
+        """Test that PostgreSQL gets the lock and then every upgrade statement."""
+        statements = self._run_upgrade(False)
+
+        assert statements[0] == "SET LOCAL statement_timeout = 0"
+        assert statements[1] == "SELECT pg_advisory_xact_lock(:key)"
+        upgrades = statements[2 : 2 + len(src.core.db._SCHEMA_UPGRADES)]
+        assert "ADD COLUMN IF NOT EXISTS content_hash" in upgrades[0]
+        assert all("IF NOT EXISTS" in statement for statement in upgrades)
+
+    def test_creates_player_game_unique_index_without_duplicates(self):
+        """Test that the unique index is built once no duplicate results remain."""
+        statements = self._run_upgrade(True, False)
+
+        assert "CREATE UNIQUE INDEX IF NOT EXISTS uq_pgs_player_game" in statements[-1]
+
+    def test_skips_player_game_unique_index_with_duplicates(self):
+        """Test that duplicate results leave the unique index unbuilt."""
+        statements = self._run_upgrade(True, True)
+
+        assert not any("uq_pgs_player_game ON" in statement for statement in statements)
+
+    def test_skips_other_backends(self):
+        """Test that non-PostgreSQL databases are left untouched."""
+        mock_engine = MagicMock()
+        mock_engine.dialect.name = "sqlite"
+
+        with patch("src.core.db.engine", mock_engine):
+            src.core.db.upgrade_schema()
+
+        mock_engine.begin.assert_not_called()
+
+
+class TestDisableStatementTimeout:
+    """Tests for lifting the statement timeout on bulk work."""
+
+    def test_lifts_timeout_on_postgresql(self):
+        """Test that PostgreSQL transactions get an unlimited statement timeout."""
+        connection = MagicMock()
+        connection.dialect.name = "postgresql"
+
+        src.core.db.disable_statement_timeout(connection)
+
+        connection.execute.assert_called_once()
+        sql = str(connection.execute.call_args.args[0])
+        assert sql == "SET LOCAL statement_timeout = 0"
+
+    def test_skips_other_backends(self):
+        """Test that non-PostgreSQL connections are left untouched."""
+        connection = MagicMock()
+        connection.dialect.name = "sqlite"
+
+        src.core.db.disable_statement_timeout(connection)
+
+        connection.execute.assert_not_called()
@@ -0,0 +1,49 @@
+"""Unit tests for global exception handlers."""
+
+import json
+from unittest.mock import MagicMock
+
+from fastapi import Request
+from sqlalchemy.exc import OperationalError
+
+from src.core.error_handlers import not_found_handler, sqlalchemy_handler
+from src.core.exceptions import NotFoundError
+
+
+class TestNotFoundHandler:
+    """Tests for not_found_handler."""
+
+    def test_returns_404_with_error_payload(self):
+        """Test that the exception's code, message and details are returned."""
+        exc = NotFoundError(message="Player 1 not found", details={"id": 1})
+
+        response = not_found_handler(MagicMock(spec=Request), exc)
+
+        assert response.status_code == 404
+        assert json.loads(response.body) == {
+            "error": {
+                "code": "not_found",
+                "message": "Player 1 not found",
+                "details": {"id": 1},
+            }
+        }
+
+
+class TestSqlalchemyHandler:
+    """Tests for sqlalchemy_handler."""
+
+    def test_returns_generic_500_without_error_details(self):
+        """Test that database errors are reported without leaking the cause."""
+        exc = OperationalError("SELECT 1", {}, Exception("connection refused"))
+
+        response = sqlalchemy_handler(MagicMock(spec=Request), exc)
+
+        assert response.status_code == 500
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == {
+            "error": {
+                "code": "database_error",
+                "message": "Database error",
+                "details": {},
+            }
+        }
@@ -1,18 +1,28 @@
 """Unit tests for game DAO."""
 
+from unittest.mock import MagicMock
+
 import pytest
+from sqlmodel import select
 
 from src.dao.game_dao import (
+    bulk_create_ledger_entries,
+    bulk_create_player_game_stats,
     create_game,
     create_ledger_entry,
     create_player_game_stats,
+    game_exists_for_content_hash,
+    game_exists_for_date,
     get_game_by_date,
     get_game_by_id,
+    get_game_nets_by_player,
+    get_player_game_nets,
     get_player_game_stats,
+    get_player_ids_with_game_stats,
     get_player_stats_with_games,
     has_ledger_entries,
 )
-from src.models.models import Game, LedgerEntry, PlayerGameStats
+from src.models.models import Game, LedgerEntry, Player, PlayerGameStats
 
 
 class TestGetGameById:
@@ -46,6 +56,33 @@ class TestGetGameByDate:
         assert result is None
 
 
+class TestGameExistsForDate:
+    """Tests for game_exists_for_date."""
+
+    def test_true_when_game_exists(self, session, sample_game):
+        """Test that an existing game's date is reported."""
+        assert game_exists_for_date(session, sample_game.date_str) is True
+
+    def test_false_when_not_found(self, session):
+        """Test that unknown dates are not reported."""
+        assert game_exists_for_date(session, "99_99_99") is False
+
+
+class TestGameExistsForContentHash:
+    """Tests for game_exists_for_content_hash."""
+
+    def test_true_when_hash_matches(self, session):
+        """Test that a game is found by its ledger hash."""
+        create_game(session, Game(date_str="24_01_02", content_hash="abc123"))
+
+        assert game_exists_for_content_hash(session, "abc123") is True
+
+    def test_false_when_not_found(self, session, sample_game):
+        """Test that games without a matching hash are not reported."""
+        assert sample_game.content_hash is None
+        assert game_exists_for_content_hash(session, "abc123") is False
+
+
 class TestCreateGame:
     """Tests for create_game."""
 
@@ -106,6 +143,62 @@ class TestCreateLedgerEntry:
         assert result.net == pytest.approx(100.0)
 
 
+class TestBulkCreateLedgerEntries:
+    """Tests for bulk_create_ledger_entries."""
+
+    def test_inserts_all_rows(self, session, sample_game, sample_player):
+        """Test that every row is inserted for the game."""
+        rows = [
+            {
+                "game_id": sample_game.id,
+                "player_id": sample_player.id,
+                "player_nickname": f"Nick{i}",
+                "player_id_csv": f"id{i}",
+                "net": float(i),
+            }
+            for i in range(3)
+        ]
+
+        bulk_create_ledger_entries(session, rows)
+        session.commit()
+
+        entries = session.exec(select(LedgerEntry)).all()
+        assert sorted(e.player_nickname for e in entries) == ["Nick0", "Nick1", "Nick2"]
+
+    def test_streams_rows_with_copy_on_postgresql(self):
+        """Test that PostgreSQL loads rows with COPY instead of INSERT."""
+        session = MagicMock()
+        connection = session.connection.return_value
+        connection.dialect.name = "postgresql"
+        driver_connection = connection.connection.driver_connection
+        cursor = driver_connection.cursor.return_value.__enter__.return_value
+        copy = cursor.copy.return_value.__enter__.return_value
+        row = {
+            "game_id": 1,
+            "player_id": 2,
+            "player_nickname": "Nick",
+            "player_id_csv": "id1",
+            "session_start_at": None,
+            "session_end_at": None,
+            "buy_in": 100.0,
+            "buy_out": 150.0,
+            "stack": 150.0,
+            "net": 50.0,
+        }
+
+        bulk_create_ledger_entries(session, [row])
+
+        assert cursor.copy.call_args.args[0].startswith("COPY ledgerentry (")
+        copy.write_row.assert_called_once_with(list(row.values()))
+        connection.execute.assert_not_called()
+
+    def test_no_rows_is_a_no_op(self, session, sample_game):
+        """Test that an empty batch inserts nothing."""
+        bulk_create_ledger_entries(session, [])
+
+        assert not has_ledger_entries(session, sample_game.id)
+
+
 class TestGetPlayerGameStats:
     """Tests for get_player_game_stats."""
 
@@ -148,6 +241,38 @@ class TestCreatePlayerGameStats:
         assert result.game_id == sample_game.id
 
 
+class TestBulkCreatePlayerGameStats:
+    """Tests for bulk_create_player_game_stats."""
+
+    def test_inserts_all_rows(self, session, sample_player, sample_game):
+        """Test that stats rows are inserted and visible to the session."""
+        bulk_create_player_game_stats(
+            session,
+            [{"player_id": sample_player.id, "game_id": sample_game.id, "net": 75.0}],
+        )
+
+        result = get_player_game_stats(session, sample_player.id, sample_game.id)
+        assert result is not None
+        assert result.net == pytest.approx(75.0)
+
+
+class TestGetPlayerIdsWithGameStats:
+    """Tests for get_player_ids_with_game_stats."""
+
+    def test_returns_ids_of_players_in_game(self, session, sample_player, sample_game):
+        """Test that only players with stats for the game are returned."""
+        other_game = create_game(session, Game(date_str="24_02_01"))
+        session.add(
+            PlayerGameStats(player_id=sample_player.id, game_id=sample_game.id, net=1.0)
+        )
+        session.commit()
+
+        assert get_player_ids_with_game_stats(session, sample_game.id) == {
+            sample_player.id
+        }
+        assert get_player_ids_with_game_stats(session, other_game.id) == set()
+
+
 class TestGetPlayerStatsWithGames:
     """Tests for get_player_stats_with_games."""
 
@@ -181,6 +306,64 @@ class TestGetPlayerStatsWithGames:
             assert stat.player_id == sample_player.id
 
 
+class TestGetPlayerGameNets:
+    """Tests for get_player_game_nets."""
+
+    def test_returns_empty_list_when_no_stats(self, session, sample_player):
+        """Test that empty list is returned when no stats exist."""
+        assert get_player_game_nets(session, sample_player.id) == []
+
+    def test_returns_date_and_net_per_game(self, session, sample_player, sample_games):
+        """Test that each game's date string is paired with the player's net."""
+        session.add_all([
+            PlayerGameStats(
+                player_id=sample_player.id, game_id=sample_games[0].id, net=100.0
+            ),
+            PlayerGameStats(
+                player_id=sample_player.id, game_id=sample_games[1].id, net=-50.0
+            ),
+        ])
+        session.commit()
+
+        result = get_player_game_nets(session, sample_player.id)
+
+        assert sorted(result) == sorted([
+            (sample_games[0].date_str, 100.0),
+            (sample_games[1].date_str, -50.0),
+        ])
+
+
+class TestGetGameNetsByPlayer:
+    """Tests for get_game_nets_by_player."""
+
+    def test_groups_game_nets_by_player(self, session, sample_games):
+        """Test that each player's games are returned under their ID."""
+        alice = Player(name="Alice")
+        bob = Player(name="Bob")
+        idle = Player(name="Idle")
+        session.add_all([alice, bob, idle])
+        session.flush()
+        session.add_all([
+            PlayerGameStats(player_id=alice.id, game_id=sample_games[0].id, net=10.0),
+            PlayerGameStats(player_id=alice.id, game_id=sample_games[1].id, net=5.0),
+            PlayerGameStats(player_id=bob.id, game_id=sample_games[0].id, net=-15.0),
+        ])
+        session.commit()
+
+        result = get_game_nets_by_player(session, [alice.id, bob.id, idle.id])
+
+        assert sorted(result[alice.id]) == sorted([
+            (sample_games[0].date_str, 10.0),
+            (sample_games[1].date_str, 5.0),
+        ])
+        assert result[bob.id] == [(sample_games[0].date_str, -15.0)]
+        assert idle.id not in result
+
+    def test_no_players(self, session):
+        """Test that no query result is needed for an empty ID list."""
+        assert get_game_nets_by_player(session, []) == {}
+
+
 class TestRelationshipBackPopulates:
     """Tests for relationship back-populates."""
 
@@ -1,6 +1,8 @@
 """Unit tests for game service."""
 
+import asyncio
 from io import BytesIO
+from tempfile import SpooledTemporaryFile
 from unittest.mock import MagicMock, patch
 
 from fastapi import UploadFile
@@ -19,7 +21,7 @@ class TestProcessUploadedFile:
         file = MagicMock(spec=UploadFile)
         file.filename = None
 
-        result = process_uploaded_file(file)
+        result = asyncio.run(process_uploaded_file(file))
 
         assert result.status == "error"
         assert result.filename == "unknown"
@@ -30,12 +32,40 @@ class TestProcessUploadedFile:
         file = MagicMock(spec=UploadFile)
         file.filename = "test.txt"
 
-        result = process_uploaded_file(file)
+        result = asyncio.run(process_uploaded_file(file))
 
         assert result.status == "error"
         assert result.filename == "test.txt"
         assert "CSV" in result.message
 
+    def test_dotfile_named_csv_returns_error(self):
+        """Test that a bare ".csv" name without a stem is rejected."""
+        file = MagicMock(spec=UploadFile)
+        file.filename = ".csv"
+
+        result = asyncio.run(process_uploaded_file(file))
+
+        assert result.status == "error"
+        assert "CSV" in result.message
+
+    def test_uppercase_csv_extension_accepted(self, mock_ledgers_dir):
+        """Test that the CSV extension check is case-insensitive."""
+        file = MagicMock(spec=UploadFile)
+        file.filename = "ledger23_10_08.CSV"
+        file.file = BytesIO(b"player_nickname,player_id,buy_in,buy_out,stack,net\n")
+
+        with (
+            patch(
+                "src.services.game_service.import_single_ledger_from_stream"
+            ) as mock_import,
+            patch("src.services.game_service.Session"),
+        ):
+            mock_import.return_value = ImportResult.SUCCESS
+            result = asyncio.run(process_uploaded_file(file))
+
+        assert result.status == "success"
+        assert (mock_ledgers_dir / "ledger23_10_08.CSV").exists()
+
     def test_path_traversal_sanitized(self, mock_ledgers_dir):
         """Test that path traversal attempts are sanitized (S2083)."""
         file_content = b"player_nickname,player_id,buy_in,buy_out,stack,net\n"
@@ -45,11 +75,13 @@ class TestProcessUploadedFile:
         file.file = BytesIO(file_content)
 
         with (
-            patch("src.services.game_service.import_single_ledger") as mock_import,
+            patch(
+                "src.services.game_service.import_single_ledger_from_stream"
+            ) as mock_import,
             patch("src.services.game_service.Session"),
         ):
             mock_import.return_value = ImportResult.SUCCESS
-            result = process_uploaded_file(file)
+            result = asyncio.run(process_uploaded_file(file))
 
         # The filename should be sanitized to just the base name
         assert result.filename == "passwd.csv"
@@ -70,11 +102,13 @@ class TestProcessUploadedFile:
         file.file = BytesIO(file_content)
 
         with (
-            patch("src.services.game_service.import_single_ledger") as mock_import,
+            patch(
+                "src.services.game_service.import_single_ledger_from_stream"
+            ) as mock_import,
             patch("src.services.game_service.Session"),
         ):
             mock_import.return_value = ImportResult.SUCCESS
-            result = process_uploaded_file(file)
+            result = asyncio.run(process_uploaded_file(file))
 
         # On Unix, backslashes are part of the filename (not path separators)
         # The file is safely written to the ledgers directory with backslashes in the name
@@ -99,12 +133,14 @@ class TestProcessUploadedFile:
         file.file = BytesIO(file_content)
 
         with (
-            patch("src.services.game_service.import_single_ledger") as mock_import,
+            patch(
+                "src.services.game_service.import_single_ledger_from_stream"
+            ) as mock_import,
             patch("src.services.game_service.Session"),
         ):
             mock_import.return_value = ImportResult.SUCCESS
 
-            result = process_uploaded_file(file)
+            result = asyncio.run(process_uploaded_file(file))
 
         assert result.status == "success"
         assert result.filename == "ledger23_12_10.csv"
@@ -113,6 +149,30 @@ class TestProcessUploadedFile:
         assert saved_file.exists()
         assert saved_file.read_bytes() == file_content
 
+    def test_spooled_upload_is_copied_to_disk(self, mock_ledgers_dir):
+        """Test that a spooled temp file upload is persisted byte-for-byte."""
+        file_content = b"player_nickname,player_id,buy_in,buy_out,stack,net\n" * 500
+        file = MagicMock(spec=UploadFile)
+        file.filename = "ledger23_12_14.csv"
+
+        with (
+            SpooledTemporaryFile(max_size=1024) as spooled,
+            patch(
+                "src.services.game_service.import_single_ledger_from_stream"
+            ) as mock_import,
+            patch("src.services.game_service.Session"),
+        ):
+            spooled.write(file_content)
+            spooled.seek(0)
+            file.file = spooled
+            mock_import.return_value = ImportResult.SUCCESS
+
+            result = asyncio.run(process_uploaded_file(file))
+
+        assert result.status == "success"
+        saved_file = mock_ledgers_dir / "ledger23_12_14.csv"
+        assert saved_file.read_bytes() == file_content
+
     def test_game_exists_returns_skipped(self, mock_ledgers_dir):
         """Test that game already exists returns skipped and writes file."""
         file_content = b"player_nickname,player_id,buy_in,buy_out,stack,net\n"
@@ -121,12 +181,14 @@ class TestProcessUploadedFile:
         file.file = BytesIO(file_content)
 
         with (
-            patch("src.services.game_service.import_single_ledger") as mock_import,
+            patch(
+                "src.services.game_service.import_single_ledger_from_stream"
+            ) as mock_import,
             patch("src.services.game_service.Session"),
         ):
             mock_import.return_value = ImportResult.GAME_EXISTS
 
-            result = process_uploaded_file(file)
+            result = asyncio.run(process_uploaded_file(file))
 
         assert result.status == "skipped"
         assert "already exists" in result.message.lower()
@@ -142,12 +204,14 @@ class TestProcessUploadedFile:
         file.file = BytesIO(file_content)
 
         with (
-            patch("src.services.game_service.import_single_ledger") as mock_import,
+            patch(
+                "src.services.game_service.import_single_ledger_from_stream"
+            ) as mock_import,
             patch("src.services.game_service.Session"),
         ):
             mock_import.return_value = ImportResult.MISSING_NICKNAMES
 
-            result = process_uploaded_file(file)
+            result = asyncio.run(process_uploaded_file(file))
 
         assert result.status == "error"
         assert "nickname" in result.message.lower()
@@ -167,7 +231,7 @@ class TestProcessUploadedFile:
                 side_effect=SQLAlchemyError("DB error")
             )
 
-            result = process_uploaded_file(file)
+            result = asyncio.run(process_uploaded_file(file))
 
         assert result.status == "error"
         assert "import" in result.message.lower() or "error" in result.message.lower()
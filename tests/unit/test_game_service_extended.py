@@ -1,12 +1,18 @@
 """Extended unit tests for game service - covering OSError handling."""
 
+import asyncio
+import hashlib
 from io import BytesIO
 from unittest.mock import MagicMock, mock_open, patch
 
 from fastapi import UploadFile
 from sqlalchemy.exc import SQLAlchemyError
 
-from src.services.game_service import process_uploaded_file
+from src.services.game_service import (
+    UPLOAD_CHUNK_SIZE,
+    _copy_upload,  # noqa: PLC2701
+    process_uploaded_file,
+)
 
 
 class TestProcessUploadedFileOsError:
@@ -26,7 +32,7 @@ class TestProcessUploadedFileOsError:
                 "src.services.game_service.Path.open", side_effect=OSError("Disk full")
             ),
         ):
-            result = process_uploaded_file(mock_file)
+            result = asyncio.run(process_uploaded_file(mock_file))
 
         assert result.status == "error"
         assert result.filename == "ledger23_11_01.csv"
@@ -45,7 +51,7 @@ class TestProcessUploadedFileOsError:
                 side_effect=PermissionError("Permission denied"),
             ),
         ):
-            result = process_uploaded_file(mock_file)
+            result = asyncio.run(process_uploaded_file(mock_file))
 
         assert result.status == "error"
         assert "Permission denied" in result.message
@@ -55,7 +61,7 @@ class TestProcessUploadedFileOsError:
         mock_file = MagicMock(spec=UploadFile)
         mock_file.filename = None
 
-        result = process_uploaded_file(mock_file)
+        result = asyncio.run(process_uploaded_file(mock_file))
 
         assert result.filename == "unknown"
         assert result.status == "error"
@@ -66,7 +72,7 @@ class TestProcessUploadedFileOsError:
         mock_file = MagicMock(spec=UploadFile)
         mock_file.filename = ""
 
-        result = process_uploaded_file(mock_file)
+        result = asyncio.run(process_uploaded_file(mock_file))
 
         assert result.filename == "unknown"
         assert result.status == "error"
@@ -76,7 +82,7 @@ class TestProcessUploadedFileOsError:
         mock_file = MagicMock(spec=UploadFile)
         mock_file.filename = "ledger.txt"
 
-        result = process_uploaded_file(mock_file)
+        result = asyncio.run(process_uploaded_file(mock_file))
 
         assert result.status == "error"
         assert "CSV" in result.message
@@ -87,16 +93,14 @@ class TestProcessUploadedFileOsError:
         mock_file.filename = "ledger23_11_03.csv"
         # Create file that raises error when read
         mock_file.file = MagicMock()
-        mock_file.file.read = MagicMock(side_effect=OSError("Read error"))
+        mock_file.file.readinto = MagicMock(side_effect=OSError("Read error"))
 
-        # shutil.copyfileobj will call read on the source
+        # The pooled copy loop calls readinto on the source
         with (
             patch("src.services.game_service.Path.mkdir"),
-            patch("src.services.game_service.shutil.copyfileobj") as mock_copy,
             patch("src.services.game_service.Path.open", mock_open()),
         ):
-            mock_copy.side_effect = OSError("Copy failed")
-            result = process_uploaded_file(mock_file)
+            result = asyncio.run(process_uploaded_file(mock_file))
 
         assert result.status == "error"
 
@@ -113,13 +117,27 @@ class TestProcessUploadedFileSqlAlchemyError:
         with (
             patch("src.services.game_service.Path.mkdir"),
             patch("src.services.game_service.Path.open", mock_open()),
-            patch("src.services.game_service.shutil.copyfileobj"),
+            patch("src.services.game_service._copy_upload"),
             patch("src.services.game_service.Session") as mock_session,
         ):
             mock_session.return_value.__enter__ = MagicMock(
                 side_effect=SQLAlchemyError("DB error")
             )
-            result = process_uploaded_file(mock_file)
+            result = asyncio.run(process_uploaded_file(mock_file))
 
         assert result.status == "error"
         assert "import" in result.message.lower() or "DB error" in result.message
+
+
+class TestCopyUpload:
+    """Tests for the pooled-buffer upload copy."""
+
+    def test_copies_content_spanning_several_chunks(self):
+        """Test that uploads larger than one buffer are copied intact."""
+        content = bytes(range(256)) * (UPLOAD_CHUNK_SIZE * 2 // 256 + 7)
+
+        for _ in range(2):  # second copy reuses the pooled buffer
+            destination = BytesIO()
+            digest = _copy_upload(BytesIO(content), destination)
+            assert destination.getvalue() == content
+            assert digest == hashlib.sha256(content).hexdigest()
@@ -1,7 +1,6 @@
 """Unit tests for import service."""
 
-from pathlib import Path
-import tempfile
+from io import BytesIO
 
 import pytest
 from sqlmodel import select
@@ -11,21 +10,16 @@ from src.models.models import Game, LedgerEntry, PlayerGameStats, PlayerNickname
 from src.services.import_service import (
     ImportResult,
     import_single_ledger,
+    import_single_ledger_from_stream,
 )
 
 
-def create_temp_ledger(content: str, date_str: str = "23_11_25") -> Path:
-    """Helper to create a properly named temporary ledger file."""
-    temp_dir = Path(tempfile.gettempdir())
-    temp_path = temp_dir / f"ledger{date_str}.csv"
-    temp_path.write_text(content)
-    return temp_path
-
-
 class TestImportSingleLedger:
     """Tests for import_single_ledger."""
 
-    def test_missing_nickname_returns_missing_nicknames(self, session, sample_player):
+    def test_missing_nickname_returns_missing_nicknames(
+        self, session, sample_player, make_ledger
+    ):
         """Test that any missing nickname aborts with MISSING_NICKNAMES."""
         # Create nickname for sample_player
         create_nickname(
@@ -43,15 +37,14 @@ class TestImportSingleLedger:
             f"{sample_player.name},id1,100,200,200,100\n"
             "UnknownPlayer,id2,50,25,25,-25\n"  # This one doesn't exist
         )
-        temp_path = create_temp_ledger(csv_content, "23_12_01")
+        temp_path = make_ledger(csv_content, "23_12_01")
 
-        try:
-            result = import_single_ledger(session, temp_path)
-            assert result == ImportResult.MISSING_NICKNAMES
-        finally:
-            temp_path.unlink()
+        result = import_single_ledger(session, temp_path)
+        assert result == ImportResult.MISSING_NICKNAMES
 
-    def test_game_already_exists_returns_game_exists(self, session, sample_player):
+    def test_game_already_exists_returns_game_exists(
+        self, session, sample_player, make_ledger
+    ):
         """Test that duplicate game returns GAME_EXISTS."""
         # Create nickname
         create_nickname(
@@ -71,15 +64,14 @@ class TestImportSingleLedger:
             "player_nickname,player_id,buy_in,buy_out,stack,net\n"
             f"{sample_player.name},id1,100,200,200,100\n"
         )
-        temp_path = create_temp_ledger(csv_content, "23_12_02")
+        temp_path = make_ledger(csv_content, "23_12_02")
 
-        try:
-            result = import_single_ledger(session, temp_path)
-            assert result == ImportResult.GAME_EXISTS
-        finally:
-            temp_path.unlink()
+        result = import_single_ledger(session, temp_path)
+        assert result == ImportResult.GAME_EXISTS
 
-    def test_ledger_entries_exist_returns_game_exists(self, session, sample_player):
+    def test_ledger_entries_exist_returns_game_exists(
+        self, session, sample_player, make_ledger
+    ):
         """Test that pre-existing ledger entries returns GAME_EXISTS."""
         # Create nickname
         create_nickname(
@@ -97,20 +89,19 @@ class TestImportSingleLedger:
             "player_nickname,player_id,buy_in,buy_out,stack,net\n"
             f"{sample_player.name},id1,100,200,200,100\n"
         )
-        temp_path = create_temp_ledger(csv_content, "23_12_03")
+        temp_path = make_ledger(csv_content, "23_12_03")
 
-        try:
-            result1 = import_single_ledger(session, temp_path)
-            session.commit()
-            assert result1 == ImportResult.SUCCESS
+        result1 = import_single_ledger(session, temp_path)
+        session.commit()
+        assert result1 == ImportResult.SUCCESS
 
-            # Second import of same file should return GAME_EXISTS
-            result2 = import_single_ledger(session, temp_path)
-            assert result2 == ImportResult.GAME_EXISTS
-        finally:
-            temp_path.unlink()
+        # Second import of same file should return GAME_EXISTS
+        result2 = import_single_ledger(session, temp_path)
+        assert result2 == ImportResult.GAME_EXISTS
 
-    def test_successful_import_creates_records(self, session, sample_player):
+    def test_successful_import_creates_records(
+        self, session, sample_player, make_ledger
+    ):
         """Test that successful import creates Game, PlayerGameStats, LedgerEntry."""
         # Create nickname
         create_nickname(
@@ -127,33 +118,32 @@ class TestImportSingleLedger:
             "player_nickname,player_id,buy_in,buy_out,stack,net\n"
             f"{sample_player.name},id1,100,300,300,200\n"
         )
-        temp_path = create_temp_ledger(csv_content, "23_12_04")
+        temp_path = make_ledger(csv_content, "23_12_04")
 
-        try:
-            result = import_single_ledger(session, temp_path)
-            session.commit()
+        result = import_single_ledger(session, temp_path)
+        session.commit()
 
-            assert result == ImportResult.SUCCESS
+        assert result == ImportResult.SUCCESS
 
-            # Check Game was created
-            games = session.exec(select(Game)).all()
-            assert len(games) == 1
-            assert games[0].date_str == "23_12_04"
+        # Check Game was created
+        games = session.exec(select(Game)).all()
+        assert len(games) == 1
+        assert games[0].date_str == "23_12_04"
 
-            # Check PlayerGameStats was created
-            stats = session.exec(select(PlayerGameStats)).all()
-            assert len(stats) == 1
-            assert stats[0].net == pytest.approx(200.0)
+        # Check PlayerGameStats was created
+        stats = session.exec(select(PlayerGameStats)).all()
+        assert len(stats) == 1
+        assert stats[0].net == pytest.approx(200.0)
 
-            # Check LedgerEntry was created
-            entries = session.exec(select(LedgerEntry)).all()
-            assert len(entries) == 1
-            assert entries[0].buy_in == pytest.approx(100.0)
-            assert entries[0].buy_out == pytest.approx(300.0)
-        finally:
-            temp_path.unlink()
+        # Check LedgerEntry was created
+        entries = session.exec(select(LedgerEntry)).all()
+        assert len(entries) == 1
+        assert entries[0].buy_in == pytest.approx(100.0)
+        assert entries[0].buy_out == pytest.approx(300.0)
 
-    def test_import_recalculates_player_stats(self, session, sample_player):
+    def test_import_recalculates_player_stats(
+        self, session, sample_player, make_ledger
+    ):
         """Test that player stats are recalculated after import."""
         # Create nickname
         create_nickname(
@@ -172,16 +162,103 @@ class TestImportSingleLedger:
             "player_nickname,player_id,buy_in,buy_out,stack,net\n"
             f"{sample_player.name},id1,100,350,350,250\n"
         )
-        temp_path = create_temp_ledger(csv_content, "23_12_05")
+        temp_path = make_ledger(csv_content, "23_12_05")
+
+        result = import_single_ledger(session, temp_path)
+        session.commit()
+        session.refresh(sample_player)
+
+        assert result == ImportResult.SUCCESS
+        assert sample_player.net == pytest.approx(250.0)
+        assert sample_player.games_up == 1
+        assert sample_player.biggest_win == pytest.approx(250.0)
+
+
+class TestImportSingleLedgerFromStream:
+    """Tests for import_single_ledger_from_stream."""
+
+    def test_imports_from_binary_stream(self, session, sample_player):
+        """Test that a ledger is imported from a stream named by its filename."""
+        create_nickname(
+            session,
+            PlayerNickname(
+                nickname=sample_player.name,
+                player_name=sample_player.name,
+                player_id=sample_player.id,
+            ),
+        )
+        session.commit()
+
+        source = BytesIO(
+            b"player_nickname,player_id,buy_in,buy_out,stack,net\n"
+            + f"{sample_player.name},id1,100,300,300,200\n".encode()
+        )
+
+        result = import_single_ledger_from_stream(session, source, "ledger23_12_06.csv")
+        session.commit()
+
+        assert result == ImportResult.SUCCESS
+        game = session.exec(select(Game)).one()
+        assert game.date_str == "23_12_06"
+        assert game.ledger_filename == "ledger23_12_06.csv"
+        # The caller's stream is left open
+        assert not source.closed
+
+    def test_inserts_rows_across_batches(self, session, sample_player, monkeypatch):
+        """Test that ledgers larger than one batch are fully imported."""
+        monkeypatch.setattr("src.services.import_service.IMPORT_BATCH_SIZE", 2)
+        create_nickname(
+            session,
+            PlayerNickname(
+                nickname=sample_player.name,
+                player_name=sample_player.name,
+                player_id=sample_player.id,
+            ),
+        )
+        session.commit()
+        rows = "".join(f"{sample_player.name},id{i},0,{i},{i},{i}\n" for i in range(5))
+        source = BytesIO(
+            ("player_nickname,player_id,buy_in,buy_out,stack,net\n" + rows).encode()
+        )
+
+        result = import_single_ledger_from_stream(session, source, "ledger23_12_10.csv")
 
-        try:
-            result = import_single_ledger(session, temp_path)
-            session.commit()
-            session.refresh(sample_player)
+        assert result == ImportResult.SUCCESS
+        assert len(session.exec(select(LedgerEntry)).all()) == 5
+        # Only the player's first row creates their game stats
+        stats = session.exec(select(PlayerGameStats)).one()
+        assert stats.net == pytest.approx(0.0)
+
+    def test_skips_ledger_with_known_content_hash(self, session):
+        """Test that a ledger matching an imported game's hash is not parsed."""
+        session.add(Game(date_str="23_12_07", content_hash="abc123"))
+        session.commit()
+
+        # Unknown nickname would fail validation if the ledger were parsed
+        source = BytesIO(b"player_nickname,net\nNobody,10\n")
+
+        result = import_single_ledger_from_stream(
+            session, source, "ledger23_12_08.csv", content_hash="abc123"
+        )
+
+        assert result == ImportResult.GAME_EXISTS
+        assert len(session.exec(select(Game)).all()) == 1
+
+    def test_stores_content_hash_on_game(self, session, sample_player):
+        """Test that the ledger's hash is recorded on the created game."""
+        create_nickname(
+            session,
+            PlayerNickname(
+                nickname=sample_player.name,
+                player_name=sample_player.name,
+                player_id=sample_player.id,
+            ),
+        )
+        session.commit()
+        source = BytesIO(f"player_nickname,net\n{sample_player.name},10\n".encode())
+
+        import_single_ledger_from_stream(
+            session, source, "ledger23_12_09.csv", content_hash="def456"
+        )
 
-            assert result == ImportResult.SUCCESS
-            assert sample_player.net == pytest.approx(250.0)
-            assert sample_player.games_up == 1
-            assert sample_player.biggest_win == pytest.approx(250.0)
-        finally:
-            temp_path.unlink()
+        assert session.exec(select(Game)).one().content_hash == "def456"
@@ -1,33 +1,31 @@
 """Extended unit tests for import service - covering uncovered branches."""
 
+import io
 import json
 from pathlib import Path
 import tempfile
 from unittest.mock import patch
 
 import pytest
-from sqlalchemy.pool import StaticPool
-from sqlmodel import Session, SQLModel, create_engine as sm_create_engine, select
+from sqlalchemy import inspect
+from sqlmodel import Session, select
 
 from src.dao.player_dao import create_nickname
 from src.models.models import Game, LedgerEntry, Player, PlayerGameStats, PlayerNickname
 from src.services.import_service import (
     ImportResult,
+    LedgerRow,
+    _bulk_load_indexes,  # noqa: PLC2701
+    _import_ledger_file,  # noqa: PLC2701
     _parse_float,  # noqa: PLC2701
+    _parse_ledger_rows,  # noqa: PLC2701
     _validate_ledger_nicknames,  # noqa: PLC2701
     add_records,
     import_all_ledgers,
     import_single_ledger,
     reset_db,
 )
-
-
-def create_temp_ledger(content: str, date_str: str = "23_11_25") -> Path:
-    """Helper to create a properly named temporary ledger file."""
-    temp_dir = Path(tempfile.gettempdir())
-    temp_path = temp_dir / f"ledger{date_str}.csv"
-    temp_path.write_text(content)
-    return temp_path
+from tests.conftest import create_test_engine, create_test_schema
 
 
 class TestParseFloat:
@@ -58,6 +56,50 @@ class TestParseFloat:
         assert _parse_float("100") == pytest.approx(100.0)
 
 
+class TestParseLedgerRows:
+    """Tests for _parse_ledger_rows function."""
+
+    def test_reads_columns_by_header_name(self):
+        """Test that columns are matched by name regardless of their order."""
+        source = io.StringIO(
+            "net,extra,player_nickname,player_id,session_start_at,session_end_at,"
+            "buy_in,buy_out,stack\n"
+            "50,x,Alice,id1,start,end,100,150,150\n"
+        )
+
+        assert _parse_ledger_rows(source) == [
+            LedgerRow(
+                player_nickname="Alice",
+                player_id="id1",
+                session_start_at="start",
+                session_end_at="end",
+                buy_in=100.0,
+                buy_out=150.0,
+                stack=150.0,
+                net=50.0,
+            )
+        ]
+
+    def test_missing_columns_and_short_rows_read_as_empty(self):
+        """Test that absent values default like csv.DictReader's would."""
+        source = io.StringIO(
+            "player_nickname,net,session_start_at\nAlice\n\nBob,5,s,extra\n"
+        )
+
+        rows = _parse_ledger_rows(source)
+
+        assert [(r.player_nickname, r.net, r.session_start_at) for r in rows] == [
+            ("Alice", 0.0, None),
+            ("Bob", 5.0, "s"),
+        ]
+        assert rows[0].session_end_at is None
+        assert rows[1].player_id == ""
+
+    def test_empty_source_has_no_rows(self):
+        """Test that a file without a header yields no rows."""
+        assert _parse_ledger_rows(io.StringIO("")) == []
+
+
 class TestAddRecords:
     """Tests for add_records function."""
 
@@ -145,12 +187,8 @@ class TestResetDb:
     def test_drops_and_recreates_tables(self):
         """Test that reset_db drops all tables and recreates them."""
         # Create a separate engine for reset_db testing
-        reset_engine = sm_create_engine(
-            "sqlite:///:memory:",
-            connect_args={"check_same_thread": False},
-            poolclass=StaticPool,
-        )
-        SQLModel.metadata.create_all(reset_engine)
+        reset_engine = create_test_engine()
+        create_test_schema(reset_engine)
 
         # Create some data first
         with Session(reset_engine) as session:
@@ -211,6 +249,178 @@ class TestImportAllLedgers:
                 games = session.exec(select(Game)).all()
                 assert len(games) == 2
 
+    def test_rebuilds_player_stats_once_after_import(self, test_engine):
+        """Test that player stats cover every imported ledger."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            ledgers_dir = Path(temp_dir)
+            with Session(test_engine) as session:
+                player = Player(name="Alice", flag="🏳️", putr="5.0")
+                session.add(player)
+                session.flush()
+                session.add(
+                    PlayerNickname(
+                        nickname="Alice", player_name="Alice", player_id=player.id
+                    )
+                )
+                session.commit()
+
+            header = "player_nickname,player_id,buy_in,buy_out,stack,net\n"
+            (ledgers_dir / "ledger23_11_01.csv").write_text(
+                header + "Alice,id1,100,200,200,100\n"
+            )
+            (ledgers_dir / "ledger23_11_02.csv").write_text(
+                header + "Alice,id1,100,50,50,-50\n"
+            )
+
+            with (
+                patch("src.services.import_service.engine", test_engine),
+                patch(
+                    "src.services.import_service.recalculate_players_stats"
+                ) as mock_recalculate,
+            ):
+                import_all_ledgers(temp_dir)
+
+            # Stats are not recalculated per ledger, only in the final rebuild
+            mock_recalculate.assert_not_called()
+            with Session(test_engine) as session:
+                alice = session.exec(select(Player)).one()
+                assert alice.net == pytest.approx(50.0)
+                assert alice.games_up == 1
+                assert alice.games_down == 1
+
+    def test_imports_uppercase_csv_suffix(self, test_engine):
+        """Test that ledgers saved with an upper-case .CSV suffix are imported."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with Session(test_engine) as session:
+                player = Player(name="Alice", flag="🏳️", putr="5.0")
+                session.add(player)
+                session.flush()
+                session.add(
+                    PlayerNickname(
+                        nickname="Alice", player_name="Alice", player_id=player.id
+                    )
+                )
+                session.commit()
+            (Path(temp_dir) / "ledger23_11_03.CSV").write_text(
+                "player_nickname,player_id,buy_in,buy_out,stack,net\n"
+                "Alice,id1,100,200,200,100\n"
+            )
+
+            with patch("src.services.import_service.engine", test_engine):
+                import_all_ledgers(temp_dir)
+
+            with Session(test_engine) as session:
+                game = session.exec(select(Game)).one()
+                assert game.date_str == "23_11_03"
+
+    def test_rebuilds_stats_of_committed_ledgers_when_one_fails(self, test_engine):
+        """Test that a failing file leaves the other ledgers' stats up to date."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with Session(test_engine) as session:
+                player = Player(name="Alice", flag="🏳️", putr="5.0")
+                session.add(player)
+                session.flush()
+                session.add(
+                    PlayerNickname(
+                        nickname="Alice", player_name="Alice", player_id=player.id
+                    )
+                )
+                session.commit()
+            (Path(temp_dir) / "ledger23_11_03.csv").write_text(
+                "player_nickname,player_id,buy_in,buy_out,stack,net\n"
+                "Alice,id1,100,200,200,100\n"
+            )
+            (Path(temp_dir) / "ledger23_11_04.csv").write_text(
+                "player_nickname,player_id,buy_in,buy_out,stack,net\n"
+                "Alice,id1,100,abc,0,-100\n"
+            )
+
+            with (
+                patch("src.services.import_service.engine", test_engine),
+                pytest.raises(ValueError, match="abc"),
+            ):
+                import_all_ledgers(temp_dir)
+
+            with Session(test_engine) as session:
+                alice = session.exec(select(Player)).one()
+                assert alice.net == pytest.approx(100.0)
+                assert alice.games_up == 1
+                assert alice.games_down == 0
+                assert len(session.exec(select(Game)).all()) == 1
+
+    @staticmethod
+    def _missing_deferred_indexes(engine) -> set[str]:
+        """Names of the bulk-load indexes that do not currently exist."""
+        inspector = inspect(engine)
+        existing = {
+            index["name"]
+            for table in ("ledgerentry", "playergamestats")
+            for index in inspector.get_indexes(table)
+        }
+        return {index.name for index in _bulk_load_indexes()} - existing
+
+    def test_defer_indexes_drops_indexes_during_load_and_rebuilds_them(
+        self, test_engine
+    ):
+        """Test that indexes are absent while ledgers load and exist afterwards."""
+        assert _bulk_load_indexes()
+        missing_during_load: list[set[str]] = []
+
+        def import_and_inspect(csv_file, player_ids_by_nickname):
+            missing_during_load.append(self._missing_deferred_indexes(test_engine))
+            return _import_ledger_file(csv_file, player_ids_by_nickname)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with Session(test_engine) as session:
+                player = Player(name="Alice", flag="🏳️", putr="5.0")
+                session.add(player)
+                session.flush()
+                session.add(
+                    PlayerNickname(
+                        nickname="Alice", player_name="Alice", player_id=player.id
+                    )
+                )
+                session.commit()
+            (Path(temp_dir) / "ledger23_11_03.csv").write_text(
+                "player_nickname,player_id,buy_in,buy_out,stack,net\n"
+                "Alice,id1,100,200,200,100\n"
+            )
+
+            with (
+                patch("src.services.import_service.engine", test_engine),
+                patch(
+                    "src.services.import_service._import_ledger_file",
+                    side_effect=import_and_inspect,
+                ),
+            ):
+                import_all_ledgers(temp_dir, defer_indexes=True)
+
+            assert missing_during_load == [
+                {index.name for index in _bulk_load_indexes()}
+            ]
+            assert not self._missing_deferred_indexes(test_engine)
+            with Session(test_engine) as session:
+                assert len(session.exec(select(LedgerEntry)).all()) == 1
+
+    def test_defer_indexes_rebuilds_indexes_when_import_fails(self, test_engine):
+        """Test that a failing import still leaves the dropped indexes rebuilt."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / "ledger23_11_03.csv").write_text(
+                "player_nickname,player_id,buy_in,buy_out,stack,net\n"
+            )
+
+            with (
+                patch("src.services.import_service.engine", test_engine),
+                patch(
+                    "src.services.import_service._import_ledger_file",
+                    side_effect=RuntimeError("import failed"),
+                ),
+                pytest.raises(RuntimeError, match="import failed"),
+            ):
+                import_all_ledgers(temp_dir, defer_indexes=True)
+
+        assert not self._missing_deferred_indexes(test_engine)
+
     def test_handles_nonexistent_directory(self, test_engine):
         """Test that import_all_ledgers handles missing directory gracefully."""
         # Should not raise exception when directory doesn't exist
@@ -223,7 +433,9 @@ class TestImportAllLedgers:
 class TestImportSingleLedgerExtended:
     """Extended tests for import_single_ledger edge cases."""
 
-    def test_existing_player_game_stats_skips_creation(self, session, sample_player):
+    def test_existing_player_game_stats_skips_creation(
+        self, session, sample_player, make_ledger
+    ):
         """Test that existing PlayerGameStats are not duplicated."""
         # Create nickname for player
         create_nickname(
@@ -253,16 +465,15 @@ class TestImportSingleLedgerExtended:
             "player_nickname,player_id,buy_in,buy_out,stack,net\n"
             f"{sample_player.name},id1,100,200,200,100\n"
         )
-        temp_path = create_temp_ledger(csv_content, "23_12_10")
+        temp_path = make_ledger(csv_content, "23_12_10")
 
-        try:
-            # But the game already exists so it should return GAME_EXISTS
-            result = import_single_ledger(session, temp_path)
-            assert result == ImportResult.GAME_EXISTS
-        finally:
-            temp_path.unlink()
+        # But the game already exists so it should return GAME_EXISTS
+        result = import_single_ledger(session, temp_path)
+        assert result == ImportResult.GAME_EXISTS
 
-    def test_validates_all_nicknames_before_import(self, session, sample_player):
+    def test_validates_all_nicknames_before_import(
+        self, session, sample_player, make_ledger
+    ):
         """Test that validation happens before any imports."""
         create_nickname(
             session,
@@ -280,19 +491,16 @@ class TestImportSingleLedgerExtended:
             f"{sample_player.name},id1,100,200,200,100\n"
             "UnknownPlayer,id2,100,50,50,-50\n"
         )
-        temp_path = create_temp_ledger(csv_content, "23_12_11")
+        temp_path = make_ledger(csv_content, "23_12_11")
 
-        try:
-            result = import_single_ledger(session, temp_path)
-            assert result == ImportResult.MISSING_NICKNAMES
+        result = import_single_ledger(session, temp_path)
+        assert result == ImportResult.MISSING_NICKNAMES
 
-            # Verify no game was created
-            games = session.exec(select(Game)).all()
-            assert len(games) == 0
-        finally:
-            temp_path.unlink()
+        # Verify no game was created
+        games = session.exec(select(Game)).all()
+        assert len(games) == 0
 
-    def test_import_with_empty_net_value(self, session, sample_player):
+    def test_import_with_empty_net_value(self, session, sample_player, make_ledger):
         """Test importing ledger with empty net value."""
         create_nickname(
             session,
@@ -308,40 +516,37 @@ class TestImportSingleLedgerExtended:
             "player_nickname,player_id,buy_in,buy_out,stack,net\n"
             f"{sample_player.name},id1,100,100,100,\n"  # Empty net
         )
-        temp_path = create_temp_ledger(csv_content, "23_12_12")
+        temp_path = make_ledger(csv_content, "23_12_12")
 
-        try:
-            result = import_single_ledger(session, temp_path)
-            session.commit()
+        result = import_single_ledger(session, temp_path)
+        session.commit()
 
-            assert result == ImportResult.SUCCESS
+        assert result == ImportResult.SUCCESS
 
-            # Verify entry was created with 0.0 net
-            entries = session.exec(select(LedgerEntry)).all()
-            assert len(entries) == 1
-            assert entries[0].net == pytest.approx(0.0)
-        finally:
-            temp_path.unlink()
+        # Verify entry was created with 0.0 net
+        entries = session.exec(select(LedgerEntry)).all()
+        assert len(entries) == 1
+        assert entries[0].net == pytest.approx(0.0)
 
 
 class TestValidateLedgerNicknames:
     """Tests for _validate_ledger_nicknames function."""
 
-    def test_returns_none_for_missing_nicknames(self, session):
+    def test_returns_none_for_missing_nicknames(self, session, make_ledger):
         """Test that missing nicknames returns None."""
         csv_content = (
             "player_nickname,player_id,buy_in,buy_out,stack,net\n"
             "UnknownPlayer,id1,100,200,200,100\n"
         )
-        temp_path = create_temp_ledger(csv_content, "23_12_13")
+        temp_path = make_ledger(csv_content, "23_12_13")
 
-        try:
-            result = _validate_ledger_nicknames(session, temp_path)
-            assert result is None
-        finally:
-            temp_path.unlink()
+        with temp_path.open(encoding="utf-8") as f:
+            result = _validate_ledger_nicknames(session, f, temp_path.name)
+        assert result is None
 
-    def test_returns_rows_and_players_for_valid_nicknames(self, session, sample_player):
+    def test_returns_rows_and_players_for_valid_nicknames(
+        self, session, sample_player, make_ledger
+    ):
         """Test that valid nicknames return rows and players."""
         create_nickname(
             session,
@@ -357,29 +562,39 @@ class TestValidateLedgerNicknames:
             "player_nickname,player_id,buy_in,buy_out,stack,net\n"
             f"{sample_player.name},id1,100,200,200,100\n"
         )
-        temp_path = create_temp_ledger(csv_content, "23_12_14")
+        temp_path = make_ledger(csv_content, "23_12_14")
 
-        try:
-            result = _validate_ledger_nicknames(session, temp_path)
-            assert result is not None
-            rows, players = result
-            assert len(rows) == 1
-            assert len(players) == 1
-            assert players[0].id == sample_player.id
-        finally:
-            temp_path.unlink()
+        with temp_path.open(encoding="utf-8") as f:
+            result = _validate_ledger_nicknames(session, f, temp_path.name)
+        assert result is not None
+        rows, player_ids = result
+        assert len(rows) == 1
+        assert player_ids == [sample_player.id]
+
+    def test_uses_preloaded_nickname_map(self, session, make_ledger):
+        """Test that a preloaded map resolves nicknames without the database."""
+        csv_content = (
+            "player_nickname,player_id,buy_in,buy_out,stack,net\n"
+            "Preloaded,id1,100,200,200,100\n"
+        )
+        temp_path = make_ledger(csv_content, "23_12_16")
+
+        with temp_path.open(encoding="utf-8") as f:
+            result = _validate_ledger_nicknames(
+                session, f, temp_path.name, {"Preloaded": 7}
+            )
+        assert result is not None
+        assert result[1] == [7]
 
-    def test_handles_empty_nickname_field(self, session):
+    def test_handles_empty_nickname_field(self, session, make_ledger):
         """Test that empty nickname field is handled."""
         csv_content = (
             "player_nickname,player_id,buy_in,buy_out,stack,net\n"
             ",id1,100,200,200,100\n"  # Empty nickname
         )
-        temp_path = create_temp_ledger(csv_content, "23_12_15")
+        temp_path = make_ledger(csv_content, "23_12_15")
 
-        try:
-            result = _validate_ledger_nicknames(session, temp_path)
-            # Should return None because empty nickname won't match any player
-            assert result is None
-        finally:
-            temp_path.unlink()
+        with temp_path.open(encoding="utf-8") as f:
+            result = _validate_ledger_nicknames(session, f, temp_path.name)
+        # Should return None because empty nickname won't match any player
+        assert result is None
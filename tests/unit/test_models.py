@@ -71,6 +71,28 @@ class TestPlayerNicknameModel:
         session.rollback()
 
 
+class TestPlayerGameStatsModel:
+    """Tests for the PlayerGameStats model."""
+
+    def test_unique_player_game_constraint_raises(
+        self, session, sample_player, sample_game
+    ):
+        """Test that a second result for the same player and game is rejected."""
+        session.add(
+            PlayerGameStats(player_id=sample_player.id, game_id=sample_game.id, net=1.0)
+        )
+        session.commit()
+
+        session.add(
+            PlayerGameStats(player_id=sample_player.id, game_id=sample_game.id, net=2.0)
+        )
+
+        with pytest.raises(IntegrityError):
+            session.commit()
+
+        session.rollback()
+
+
 class TestPlayerNicknameRelationship:
     """Tests for Player <-> PlayerNickname relationship."""
 
@@ -1,15 +1,28 @@
 """Unit tests for player DAO."""
 
+from unittest.mock import patch
+
 import pytest
 from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
 
 from src.dao.player_dao import (
+    NAME_LOOKUP_BATCH_SIZE,
+    bulk_create_nicknames,
+    bulk_create_players,
+    bulk_update_players,
+    clear_player_cache,
     create_nickname,
     create_player,
     get_all_players,
+    get_existing_player_names,
     get_player_by_id,
+    get_player_by_id_cached,
     get_player_by_name,
     get_player_by_nickname,
+    get_player_ids,
+    get_player_ids_by_nickname,
+    iter_player_batches,
     update_player,
 )
 from src.models.models import Player, PlayerNickname
@@ -31,6 +44,76 @@ class TestGetPlayerById:
         assert result is None
 
 
+class TestGetPlayerByIdCached:
+    """Tests for get_player_by_id_cached."""
+
+    @pytest.fixture(autouse=True)
+    def empty_cache(self):
+        """Keep cached players from leaking between tests."""
+        clear_player_cache()
+        yield
+        clear_player_cache()
+
+    def test_repeat_lookup_is_served_from_cache(self, session, sample_player):
+        """Test that a second lookup returns the cached detached player."""
+        first = get_player_by_id_cached(session, sample_player.id)
+        second = get_player_by_id_cached(session, sample_player.id)
+
+        assert first is not None
+        assert second is first
+        assert first not in session
+
+    def test_commit_evicts_updated_player(self, session, sample_player):
+        """Test that committing a change to a player evicts its cached copy."""
+        player_id = sample_player.id
+        cached = get_player_by_id_cached(session, player_id)
+
+        player = get_player_by_id(session, player_id)
+        player.net = 42.0
+        update_player(session, player)
+        session.commit()
+
+        refreshed = get_player_by_id_cached(session, player_id)
+        assert refreshed is not cached
+        assert refreshed.net == 42.0
+
+    def test_commit_evicts_bulk_updated_player(self, session, sample_player):
+        """Test that committing a bulk update evicts the player's cached copy."""
+        player_id = sample_player.id
+        cached = get_player_by_id_cached(session, player_id)
+
+        bulk_update_players(session, [{"player_id": player_id, "net": 7.0}])
+        session.commit()
+
+        refreshed = get_player_by_id_cached(session, player_id)
+        assert refreshed is not cached
+        assert refreshed.net == 7.0
+
+    def test_returns_none_when_not_found(self, session):
+        """Test that None is returned and nothing is cached for unknown IDs."""
+        assert get_player_by_id_cached(session, 99999) is None
+
+    def test_row_loaded_before_concurrent_commit_is_not_cached(
+        self, session, sample_player, test_engine
+    ):
+        """Test that a commit landing mid-load keeps the loaded row out of cache."""
+        player_id = sample_player.id
+        load = session.get
+
+        def load_then_commit_elsewhere(*args, **kwargs):
+            loaded = load(*args, **kwargs)
+            with Session(test_engine) as writer:
+                bulk_update_players(writer, [{"player_id": player_id, "net": 9.0}])
+                writer.commit()
+            return loaded
+
+        with patch.object(session, "get", side_effect=load_then_commit_elsewhere):
+            stale = get_player_by_id_cached(session, player_id)
+
+        assert stale is not None
+        assert get_player_by_id_cached(session, player_id) is not stale
+
+
 class TestGetPlayerByName:
     """Tests for get_player_by_name."""
 
@@ -46,6 +129,23 @@ class TestGetPlayerByName:
         assert result is None
 
 
+class TestGetExistingPlayerNames:
+    """Tests for get_existing_player_names."""
+
+    def test_returns_only_known_names(self, session, sample_player):
+        """Test that unknown names are filtered out."""
+        result = get_existing_player_names(session, [sample_player.name, "Nobody"])
+
+        assert result == {sample_player.name}
+
+    def test_looks_up_names_in_batches(self, session, sample_player):
+        """Test that names spanning several IN batches are all checked."""
+        names = [f"Unknown {i}" for i in range(NAME_LOOKUP_BATCH_SIZE)]
+        names.append(sample_player.name)
+
+        assert get_existing_player_names(session, names) == {sample_player.name}
+
+
 class TestGetPlayerByNickname:
     """Tests for get_player_by_nickname."""
 
@@ -62,6 +162,40 @@ class TestGetPlayerByNickname:
         assert result is None
 
 
+class TestGetPlayerIdsByNickname:
+    """Tests for get_player_ids_by_nickname."""
+
+    def test_maps_known_nicknames_to_player_ids(
+        self, session, sample_player_with_nickname
+    ):
+        """Test that known nicknames are mapped and unknown ones are omitted."""
+        result = get_player_ids_by_nickname(session, {"Johnny", "UnknownNick"})
+        assert result == {"Johnny": sample_player_with_nickname.id}
+
+    def test_returns_empty_dict_for_no_nicknames(self, session):
+        """Test that an empty nickname set skips the query."""
+        assert get_player_ids_by_nickname(session, set()) == {}
+
+    def test_loads_every_nickname_without_filter(
+        self, session, sample_player, sample_player_with_nickname
+    ):
+        """Test that omitting the nicknames loads the whole map."""
+        create_nickname(
+            session,
+            PlayerNickname(
+                nickname="Tester",
+                player_name=sample_player.name,
+                player_id=sample_player.id,
+            ),
+        )
+        session.commit()
+
+        assert get_player_ids_by_nickname(session) == {
+            "Johnny": sample_player_with_nickname.id,
+            "Tester": sample_player.id,
+        }
+
+
 class TestGetAllPlayers:
     """Tests for get_all_players."""
 
@@ -105,6 +239,59 @@ class TestGetAllPlayers:
         all_ids = {p.id for p in page1} | {p.id for p in page2} | {p.id for p in page3}
         assert len(all_ids) == 5
 
+    def test_keyset_pagination_with_after_id(self, session):
+        """Test that after_id returns the players following that ID in order."""
+        players = [Player(name=f"Player {i}") for i in range(1, 6)]
+        session.add_all(players)
+        session.commit()
+
+        page1 = get_all_players(session, limit=2)
+        page2 = get_all_players(session, limit=2, after_id=page1[-1].id)
+
+        assert [p.name for p in page1] == ["Player 1", "Player 2"]
+        assert [p.name for p in page2] == ["Player 3", "Player 4"]
+
+
+class TestGetPlayerIds:
+    """Tests for get_player_ids."""
+
+    def test_returns_empty_list_when_no_players(self, session):
+        """Test that an empty list is returned when no players exist."""
+        assert get_player_ids(session) == []
+
+    def test_keyset_pagination_with_after_id(self, session):
+        """Test that IDs come back in order, paged by the previous page's last ID."""
+        players = [Player(name=f"Player {i}") for i in range(1, 6)]
+        session.add_all(players)
+        session.commit()
+        ids = [player.id for player in players]
+
+        page1 = get_player_ids(session, limit=2)
+        page2 = get_player_ids(session, limit=2, after_id=page1[-1])
+        page3 = get_player_ids(session, limit=2, after_id=page2[-1])
+
+        assert page1 + page2 + page3 == ids
+
+
+class TestIterPlayerBatches:
+    """Tests for iter_player_batches function."""
+
+    def test_yields_page_in_batches(self, session):
+        """Test that the page is split into batches of batch_size in ID order."""
+        session.add_all([Player(name=f"Player {i}") for i in range(1, 6)])
+        session.commit()
+
+        batches = list(iter_player_batches(session, offset=1, limit=3, batch_size=2))
+
+        assert [[p.name for p in batch] for batch in batches] == [
+            ["Player 2", "Player 3"],
+            ["Player 4"],
+        ]
+
+    def test_no_players(self, session):
+        """Test that an empty page yields no batches."""
+        assert list(iter_player_batches(session)) == []
+
 
 class TestCreatePlayer:
     """Tests for create_player."""
@@ -130,6 +317,31 @@ class TestCreatePlayer:
         session.rollback()
 
 
+class TestBulkCreatePlayers:
+    """Tests for bulk_create_players."""
+
+    def test_inserts_players_and_returns_ids(self, session):
+        """Test that every player is inserted and mapped to its new ID."""
+        result = bulk_create_players(
+            session,
+            [
+                {"name": "Alice", "flag": "🇺🇸", "putr": "5.0"},
+                {"name": "Bob", "flag": "", "putr": "UR"},
+            ],
+        )
+
+        assert set(result) == {"Alice", "Bob"}
+        alice = session.get(Player, result["Alice"])
+        assert alice is not None
+        assert alice.name == "Alice"
+        assert alice.putr == "5.0"
+        assert alice.net == pytest.approx(0.0)
+
+    def test_no_players(self, session):
+        """Test that an empty batch inserts nothing."""
+        assert bulk_create_players(session, []) == {}
+
+
 class TestUpdatePlayer:
     """Tests for update_player."""
 
@@ -146,6 +358,30 @@ class TestUpdatePlayer:
         assert sample_player.net == pytest.approx(500.0)
 
 
+class TestBulkUpdatePlayers:
+    """Tests for bulk_update_players."""
+
+    def test_updates_each_player_by_id(self, session):
+        """Test that every player gets its own values."""
+        alice = Player(name="Alice")
+        bob = Player(name="Bob")
+        session.add_all([alice, bob])
+        session.commit()
+
+        bulk_update_players(
+            session,
+            [
+                {"player_id": alice.id, "net": 10.0, "games_up": 1},
+                {"player_id": bob.id, "net": -10.0, "games_up": 0},
+            ],
+        )
+        session.commit()
+
+        assert alice.net == pytest.approx(10.0)
+        assert alice.games_up == 1
+        assert bob.net == pytest.approx(-10.0)
+
+
 class TestCreateNickname:
     """Tests for create_nickname."""
 
@@ -178,3 +414,26 @@ class TestCreateNickname:
             session.commit()
 
         session.rollback()
+
+
+class TestBulkCreateNicknames:
+    """Tests for bulk_create_nicknames."""
+
+    def test_inserts_nicknames(self, session, sample_player):
+        """Test that all nickname rows are inserted."""
+        bulk_create_nicknames(
+            session,
+            [
+                {
+                    "nickname": nickname,
+                    "player_name": sample_player.name,
+                    "player_id": sample_player.id,
+                }
+                for nickname in ("Nick1", "Nick2")
+            ],
+        )
+
+        assert get_player_ids_by_nickname(session, {"Nick1", "Nick2"}) == {
+            "Nick1": sample_player.id,
+            "Nick2": sample_player.id,
+        }
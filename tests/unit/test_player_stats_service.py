@@ -1,6 +1,7 @@
 """Unit tests for player stats calculation service."""
 
 import pytest
+from sqlalchemy import insert
 
 from src.core.exceptions import ValidationError
 from src.models.models import Game, PlayerGameStats
@@ -32,6 +33,12 @@ class TestParseDateStr:
         assert first.hour == 1
         assert second.hour == 2
 
+    def test_repeat_parse_is_cached(self):
+        """Test that parsing the same date string again reuses the result."""
+        first = parse_date_str("23_11_15(3)")
+
+        assert parse_date_str("23_11_15(3)") is first
+
     def test_invalid_format_raises_validation_error(self):
         """Test that invalid format raises ValidationError."""
         with pytest.raises(ValidationError, match="Invalid date_str format"):
@@ -142,13 +149,13 @@ class TestRecalculatePlayerStats:
 
     def test_all_games_zero_net(self, session, sample_player, sample_games):
         """Test that all zero-net games keeps counts at zero."""
-        for game in sample_games[:3]:
-            stats = PlayerGameStats(
-                player_id=sample_player.id,
-                game_id=game.id,
-                net=0.0,
-            )
-            session.add(stats)
+        session.connection().execute(
+            insert(PlayerGameStats),
+            [
+                {"player_id": sample_player.id, "game_id": game.id, "net": 0.0}
+                for game in sample_games[:3]
+            ],
+        )
         session.commit()
 
         recalculate_player_stats(session, sample_player.id)
@@ -168,13 +175,13 @@ class TestRecalculatePlayerStats:
         """Test total, average, and counts for multiple games."""
         # +100, -50, +200 = +250 total
         nets = [100.0, -50.0, 200.0]
-        for game, net in zip(sample_games[:3], nets, strict=True):
-            stats = PlayerGameStats(
-                player_id=sample_player.id,
-                game_id=game.id,
-                net=net,
-            )
-            session.add(stats)
+        session.connection().execute(
+            insert(PlayerGameStats),
+            [
+                {"player_id": sample_player.id, "game_id": game.id, "net": net}
+                for game, net in zip(sample_games[:3], nets, strict=True)
+            ],
+        )
         session.commit()
 
         recalculate_player_stats(session, sample_player.id)
@@ -200,15 +207,10 @@ class TestRecalculatePlayerStats:
         # Game 1: -100 (cum: -100, low: -100, high: 0)
         # Game 2: +200 (cum: +100, low: -100, high: 100)
         # Game 3: -50  (cum: +50,  low: -100, high: 100)
-        session.add(
-            PlayerGameStats(player_id=sample_player.id, game_id=game1.id, net=-100.0)
-        )
-        session.add(
-            PlayerGameStats(player_id=sample_player.id, game_id=game2.id, net=200.0)
-        )
-        session.add(
-            PlayerGameStats(player_id=sample_player.id, game_id=game3.id, net=-50.0)
-        )
+        session.add_all([
+            PlayerGameStats(player_id=sample_player.id, game_id=game.id, net=net)
+            for game, net in ((game1, -100.0), (game2, 200.0), (game3, -50.0))
+        ])
         session.commit()
 
         recalculate_player_stats(session, sample_player.id)
@@ -233,19 +235,14 @@ class TestRecalculatePlayerStats:
         # Chronological order: base(+100) -> (1)(-200) -> (2)(+150)
         # Cumulative: 100, -100, 50
         # Highest: 100, Lowest: -100
-        session.add(
-            PlayerGameStats(player_id=sample_player.id, game_id=game_base.id, net=100.0)
-        )
-        session.add(
-            PlayerGameStats(
-                player_id=sample_player.id, game_id=game_suffix1.id, net=-200.0
+        session.add_all([
+            PlayerGameStats(player_id=sample_player.id, game_id=game.id, net=net)
+            for game, net in (
+                (game_base, 100.0),
+                (game_suffix1, -200.0),
+                (game_suffix2, 150.0),
             )
-        )
-        session.add(
-            PlayerGameStats(
-                player_id=sample_player.id, game_id=game_suffix2.id, net=150.0
-            )
-        )
+        ])
         session.commit()
 
         recalculate_player_stats(session, sample_player.id)
@@ -8,6 +8,7 @@ from src.services.player_stats_service import (
     parse_date_str,
     recalculate_all_player_stats,
     recalculate_player_stats,
+    recalculate_players_stats,
 )
 
 
@@ -119,6 +120,19 @@ class TestRecalculateAllPlayerStats:
         # Should not raise any errors
         recalculate_all_player_stats(session)
 
+    def test_recalculates_players_across_pages(self, session):
+        """Test that players past the first page of IDs are recalculated too."""
+        players = [Player(name=f"Player {i}", net=1.0) for i in range(150)]
+        session.add_all(players)
+        session.commit()
+
+        recalculate_all_player_stats(session)
+        session.commit()
+
+        for player in players:
+            session.refresh(player)
+        assert all(player.net == pytest.approx(0.0) for player in players)
+
     def test_handles_player_with_null_id(self, session):
         """Test that players with None id are skipped gracefully."""
         # Create a normal player
@@ -130,6 +144,43 @@ class TestRecalculateAllPlayerStats:
         recalculate_all_player_stats(session)
 
 
+class TestRecalculatePlayersStats:
+    """Tests for recalculate_players_stats function."""
+
+    def test_matches_per_player_recalculation(self, session):
+        """Test that the batch gives each player the same stats as one by one."""
+        alice = Player(name="Alice")
+        bob = Player(name="Bob")
+        session.add_all([alice, bob])
+        session.flush()
+        games = [
+            Game(date_str="23_09_02", ledger_filename="ledger23_09_02.csv"),
+            Game(date_str="23_09_01", ledger_filename="ledger23_09_01.csv"),
+        ]
+        session.add_all(games)
+        session.flush()
+        session.add_all([
+            PlayerGameStats(player_id=alice.id, game_id=games[0].id, net=-30.0),
+            PlayerGameStats(player_id=alice.id, game_id=games[1].id, net=80.0),
+            PlayerGameStats(player_id=bob.id, game_id=games[1].id, net=-80.0),
+        ])
+        session.commit()
+
+        recalculate_players_stats(session, [alice.id, bob.id])
+
+        # Loaded players are expired, so they reflect the bulk UPDATE
+        assert alice.net == pytest.approx(50.0)
+        assert alice.highest_net == pytest.approx(80.0)
+        assert alice.biggest_loss == pytest.approx(-30.0)
+        assert alice.average_net == pytest.approx(25.0)
+        assert bob.games_down == 1
+        assert bob.lowest_net == pytest.approx(-80.0)
+
+    def test_ignores_unknown_player_ids(self, session):
+        """Test that IDs without a player are skipped."""
+        recalculate_players_stats(session, [99999])
+
+
 class TestRecalculatePlayerStatsEdgeCases:
     """Edge case tests for recalculate_player_stats."""
 
@@ -170,20 +221,20 @@ class TestRecalculatePlayerStatsEdgeCases:
 
         # Create games in chronological order
         dates = ["23_09_01", "23_09_02", "23_09_03", "23_09_04"]
-        games = []
-        for date in dates:
-            game = Game(date_str=date, ledger_filename=f"ledger{date}.csv")
-            session.add(game)
-            games.append(game)
+        games = [
+            Game(date_str=date, ledger_filename=f"ledger{date}.csv") for date in dates
+        ]
+        session.add_all(games)
         session.commit()
 
         # Alternating results: +100, -200, +150, -50
         # Cumulative: 100, -100, 50, 0
         # High: 100, Low: -100
         nets = [100.0, -200.0, 150.0, -50.0]
-        for game, net in zip(games, nets, strict=True):
-            stats = PlayerGameStats(player_id=player.id, game_id=game.id, net=net)
-            session.add(stats)
+        session.add_all([
+            PlayerGameStats(player_id=player.id, game_id=game.id, net=net)
+            for game, net in zip(games, nets, strict=True)
+        ])
         session.commit()
 
         recalculate_player_stats(session, player.id)
@@ -0,0 +1,27 @@
+"""Unit tests for shared response classes."""
+
+import json
+
+from src.core.responses import PydanticJSONResponse
+
+
+class TestPydanticJSONResponse:
+    """Tests for PydanticJSONResponse."""
+
+    def test_renders_compact_utf8_json(self):
+        """Test that content is encoded like the stdlib JSONResponse."""
+        content = {"name": "Zoë", "net": 1.5, "tags": ["a", "b"], "id": None}
+
+        response = PydanticJSONResponse(content)
+
+        assert (
+            response.body
+            == json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+        )
+        assert response.media_type == "application/json"
+
+    def test_renders_non_finite_floats_as_null(self):
+        """Test that NaN and infinity become null instead of invalid JSON."""
+        response = PydanticJSONResponse({"net": float("nan"), "max": float("inf")})
+
+        assert json.loads(response.body) == {"net": None, "max": None}